@@ -0,0 +1,420 @@
+"""
+Aggregation of stage 2 peer reviews into a council-wide ranking.
+
+Reviews are first reduced to a position matrix: one row per reviewer, one
+column per response under review, holding the 1-based position the reviewer
+gave it (0 if unranked). Every method works on that matrix, or on the
+pairwise preference matrix derived from it:
+
+    mean      average position (the original "street cred" ranking)
+    borda     Borda count: m - position points, unranked responses get none
+    copeland  pairwise wins minus losses; reports the Condorcet winner if any
+    kemeny    order that agrees with the most pairwise preferences (local search
+              from the Copeland order; exact Kemeny is NP-hard)
+    weighted  Borda without self-votes, each reviewer weighted by how well it
+              agrees with the other reviewers
+
+Usage (re-score stored conversations):
+    uv run python -m backend.aggregation --method copeland
+"""
+
+from typing import List, Dict, Any, Optional, Tuple
+from .ranking import canonical_label, ranking_positions
+
+METHODS = ("mean", "borda", "copeland", "kemeny", "weighted")
+EARLY_EXIT_POLICIES = ("off", "certain", "stable")
+# Methods whose leader "certain" can prove final before every review is in
+CERTAIN_METHODS = ("mean", "borda", "copeland", "kemeny")
+
+
+def build_ballots(
+    stage2_results: List[Dict[str, Any]],
+    label_to_model: Dict[str, Dict[str, Any]],
+    exclude_self_votes: bool = False
+) -> Dict[str, Any]:
+    """
+    Reduce stage 2 results to a position matrix.
+
+    Args:
+        stage2_results: Rankings from each reviewer
+        label_to_model: Label -> response info; 'excluded' responses are left out
+        exclude_self_votes: Drop each reviewer's vote on its own response (and
+            close the gap it leaves in that reviewer's positions)
+
+    Returns:
+        Dict with 'labels' (columns), 'reviewers' (row names) and 'positions'
+        (rows of 1-based positions, 0 for unranked)
+    """
+    labels = [label for label, info in label_to_model.items() if not info.get("excluded")]
+    column = {label: index for index, label in enumerate(labels)}
+
+    reviewers, positions = [], []
+    for result in stage2_results:
+        ranked = sorted(ranking_positions(result, labels).items(), key=lambda item: item[1])
+        if exclude_self_votes:
+            ranked = [(label, p) for label, p in ranked if label_to_model[label]["name"] != result["name"]]
+        row = [0] * len(labels)
+        for position, (label, _) in enumerate(ranked, start=1):
+            row[column[label]] = position
+        reviewers.append(result["name"])
+        positions.append(row)
+
+    return {"labels": labels, "reviewers": reviewers, "positions": positions}
+
+
+def pairwise_matrix(positions: List[List[int]], weights: Optional[List[float]] = None) -> List[List[float]]:
+    """
+    Weighted pairwise preferences: cell [i][j] is the weight of reviewers ranking i above j.
+
+    A ranked response counts as above an unranked one; two unranked responses
+    are not compared.
+    """
+    size = len(positions[0]) if positions else 0
+    matrix = [[0.0] * size for _ in range(size)]
+    for r, row in enumerate(positions):
+        weight = 1.0 if weights is None else weights[r]
+        if not weight:
+            continue
+        # Unranked sorts after every ranked position
+        keys = [p if p else size + 1 for p in row]
+        for i in range(size):
+            matrix_i = matrix[i]
+            key_i = keys[i]
+            for j in range(size):
+                if key_i < keys[j]:
+                    matrix_i[j] += weight
+    return matrix
+
+
+def mean_positions(positions: List[List[int]]) -> List[Tuple[float, int]]:
+    """(average position, number of reviewers who ranked it) per column."""
+    size = len(positions[0]) if positions else 0
+    totals, counts = [0] * size, [0] * size
+    for row in positions:
+        for c, p in enumerate(row):
+            if p:
+                totals[c] += p
+                counts[c] += 1
+    return [(totals[c] / counts[c] if counts[c] else 0.0, counts[c]) for c in range(size)]
+
+
+def borda_scores(positions: List[List[int]], weights: Optional[List[float]] = None) -> List[float]:
+    """Borda points per column: m - position for each ballot that ranked it."""
+    size = len(positions[0]) if positions else 0
+    scores = [0.0] * size
+    for r, row in enumerate(positions):
+        weight = 1.0 if weights is None else weights[r]
+        for c, p in enumerate(row):
+            if p:
+                scores[c] += weight * (size - p)
+    return scores
+
+
+def copeland_scores(matrix: List[List[float]]) -> List[float]:
+    """Pairwise wins minus losses per column."""
+    size = len(matrix)
+    return [
+        sum((matrix[i][j] > matrix[j][i]) - (matrix[i][j] < matrix[j][i]) for j in range(size) if j != i)
+        for i in range(size)
+    ]
+
+
+def kemeny_order(matrix: List[List[float]], start: List[int]) -> List[int]:
+    """
+    Approximate Kemeny-optimal order by local search.
+
+    Repeatedly moves single responses to the position that most increases
+    agreement with the pairwise preferences, until no move helps. O(n^2) per
+    pass, so it stays cheap for large councils.
+
+    Args:
+        matrix: Pairwise preference matrix
+        start: Initial order of column indices (e.g. by Copeland score)
+
+    Returns:
+        Column indices, best first
+    """
+    order = list(start)
+    improved = True
+    while improved:
+        improved = False
+        for index in range(len(order)):
+            candidate = order[index]
+            rest = order[:index] + order[index + 1:]
+            # Agreement contributed by candidate at each slot of rest; slot 0 is above everyone
+            gain = sum(matrix[candidate][other] for other in rest)
+            gains = [gain]
+            for other in rest:
+                gain += matrix[other][candidate] - matrix[candidate][other]
+                gains.append(gain)
+            best_slot = max(range(len(gains)), key=lambda slot: (gains[slot], -slot))
+            if gains[best_slot] > gains[index] + 1e-9:
+                order = rest[:best_slot] + [candidate] + rest[best_slot:]
+                improved = True
+    return order
+
+
+def reliability_weights(positions: List[List[int]]) -> List[float]:
+    """
+    Weight each reviewer by its agreement with the others' consensus.
+
+    The consensus is the Borda order of every other ballot; agreement is the
+    Kendall tau over pairs both ranked, mapped to [0, 1]. Reviewers with
+    nothing to compare keep weight 1.
+    """
+    size = len(positions[0]) if positions else 0
+    total = borda_scores(positions)
+    weights = []
+    for row in positions:
+        own = borda_scores([row])
+        others = [total[c] - own[c] for c in range(size)]
+        concordant = discordant = 0
+        for i in range(size):
+            for j in range(i + 1, size):
+                if not row[i] or not row[j] or others[i] == others[j]:
+                    continue
+                if (row[i] < row[j]) == (others[i] > others[j]):
+                    concordant += 1
+                else:
+                    discordant += 1
+        pairs = concordant + discordant
+        weights.append(round((1 + (concordant - discordant) / pairs) / 2, 4) if pairs else 1.0)
+    return weights
+
+
+def aggregate(
+    stage2_results: List[Dict[str, Any]],
+    label_to_model: Dict[str, Dict[str, Any]],
+    method: str = "mean",
+    exclude_self_votes: bool = False
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Rank the responses under review with one aggregation method.
+
+    Args:
+        stage2_results: Rankings from each reviewer
+        label_to_model: Label -> response info (model, name, personality)
+        method: One of METHODS
+        exclude_self_votes: Ignore reviewers' votes on their own responses
+            (always on for "weighted")
+
+    Returns:
+        Tuple of (aggregate rankings best first, each with model, personality,
+        name, average_rank, rankings_count and the method's 'score': average
+        position for mean, points for borda/weighted, wins minus losses for
+        copeland, responses placed below it for kemeny; and a summary dict with
+        the method, options and method-specific details)
+
+    Raises:
+        ValueError: If the method is unknown
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown aggregation method: {method}")
+    if method == "weighted":
+        exclude_self_votes = True
+
+    ballots = build_ballots(stage2_results, label_to_model, exclude_self_votes)
+    labels, positions = ballots["labels"], ballots["positions"]
+    summary = {"method": method, "exclude_self_votes": exclude_self_votes, "ballots": len(positions)}
+    if not positions:
+        # Every reviewer failed: nothing to aggregate
+        return [], summary
+
+    means = mean_positions(positions)
+
+    if method == "mean":
+        scores = [mean for mean, _ in means]
+        order = sorted(range(len(labels)), key=lambda c: (scores[c], -means[c][1], labels[c]))
+    elif method == "borda":
+        scores = borda_scores(positions)
+        order = sorted(range(len(labels)), key=lambda c: (-scores[c], means[c][0], labels[c]))
+    elif method == "weighted":
+        weights = reliability_weights(positions)
+        scores = [round(score, 4) for score in borda_scores(positions, weights)]
+        order = sorted(range(len(labels)), key=lambda c: (-scores[c], means[c][0], labels[c]))
+        summary["weights"] = dict(zip(ballots["reviewers"], weights))
+    else:
+        matrix = pairwise_matrix(positions)
+        copeland = copeland_scores(matrix)
+        order = sorted(range(len(labels)), key=lambda c: (-copeland[c], means[c][0], labels[c]))
+        winners = [c for c in range(len(labels)) if copeland[c] == len(labels) - 1]
+        summary["condorcet_winner"] = label_to_model[labels[winners[0]]]["name"] if winners else None
+        if method == "copeland":
+            scores = copeland
+        else:
+            order = kemeny_order(matrix, order)
+            scores = [len(order) - order.index(c) - 1 for c in range(len(labels))]
+            summary["agreement"] = sum(
+                matrix[order[i]][order[j]] for i in range(len(order)) for j in range(i + 1, len(order))
+            )
+
+    rankings = []
+    for c in order:
+        mean, count = means[c]
+        if not count:
+            continue
+        info = label_to_model[labels[c]]
+        rankings.append({
+            "model": info["model"],
+            "personality": info["personality"],
+            "name": info["name"],
+            "average_rank": round(mean, 2),
+            "rankings_count": count,
+            "score": round(scores[c], 4) if isinstance(scores[c], float) else scores[c]
+        })
+    return rankings, summary
+
+
+def early_exit_policy(policy: str, method: str) -> str:
+    """
+    The early exit policy to apply for an aggregation method.
+
+    "certain" needs a bound on how far the remaining reviews can move the
+    method's leader; reliability weights change with every review, so
+    "weighted" has none and falls back to "stable".
+    """
+    if policy == "certain" and method not in CERTAIN_METHODS:
+        return "stable"
+    return policy
+
+
+def _pairwise_winner(matrix: List[List[float]], margin: int) -> Optional[int]:
+    """The column preferred to every other by more than margin reviewers, if any."""
+    size = len(matrix)
+    for c in range(size):
+        if all(matrix[c][o] - matrix[o][c] > margin for o in range(size) if o != c):
+            return c
+    return None
+
+
+def _mean_leader(positions: List[List[int]], remaining: int) -> Optional[int]:
+    """
+    The mean-position leader, if it stays ahead even when every remaining
+    review ranks it last and its closest rival first.
+    """
+    size = len(positions[0])
+    means = mean_positions(positions)
+    ranked = [c for c in range(size) if means[c][1]]
+    if not ranked:
+        return None
+    leader = min(ranked, key=lambda c: (means[c][0], -means[c][1]))
+    mean, count = means[leader]
+    worst = (mean * count + remaining * size) / (count + remaining)
+    for c in range(size):
+        if c == leader:
+            continue
+        rival, rival_count = means[c]
+        if rival_count + remaining == 0:
+            continue
+        best = (rival * rival_count + remaining) / (rival_count + remaining)
+        if best <= worst:
+            return None
+    return leader
+
+
+def settled_leader(
+    positions: List[List[int]],
+    remaining: int,
+    policy: str,
+    leaders: List[int],
+    method: str = "borda"
+) -> Optional[int]:
+    """
+    The column that leads the reviews so far, if later reviews cannot (or are
+    unlikely to) change it.
+
+    A remaining review can move two responses at most m - 1 Borda points or
+    m - 1 positions apart, and can change each head-to-head count by one.
+    "certain" stops only when the leader under the aggregation method is
+    final whatever the remaining reviews say: for borda the Borda lead is
+    larger than m - 1 per remaining review; for mean the leader's worst
+    possible average position still beats every rival's best; for copeland
+    and kemeny a majority prefers the leader to every other response by more
+    than the remaining reviews could overturn, so it is the Condorcet winner,
+    which both methods rank first. "stable" stops once the same response has
+    led the Borda count after each of the last two reviews and is sure to be
+    the Condorcet winner in the same way: it then normally stays the leader
+    under every method, but this is not guaranteed.
+
+    Args:
+        positions: Position matrix of the reviews received so far
+        remaining: Reviews still outstanding
+        policy: One of EARLY_EXIT_POLICIES, as returned by early_exit_policy
+        leaders: Borda leader column after each earlier review (updated in place)
+        method: Aggregation method the final ranking will use
+
+    Returns:
+        The leading column, or None to keep waiting
+
+    Raises:
+        ValueError: If the policy is unknown, or "certain" has no bound for the method
+    """
+    if policy == "off" or not positions:
+        return None
+    scores = borda_scores(positions)
+    if len(scores) < 2:
+        return None
+    order = sorted(range(len(scores)), key=lambda c: -scores[c])
+    leader, lead = order[0], scores[order[0]] - scores[order[1]]
+    leaders.append(leader)
+    if not remaining:
+        return None
+
+    if policy == "certain":
+        if method == "borda":
+            return leader if lead > remaining * (len(scores) - 1) else None
+        if method == "mean":
+            return _mean_leader(positions, remaining)
+        if method in ("copeland", "kemeny"):
+            return _pairwise_winner(pairwise_matrix(positions), remaining)
+        raise ValueError(f"No certain early exit for aggregation method: {method}")
+    if policy == "stable":
+        if len(leaders) < 2 or leaders[-2] != leader:
+            return None
+        return leader if _pairwise_winner(pairwise_matrix(positions), remaining) == leader else None
+    raise ValueError(f"Unknown early exit policy: {policy}")
+
+
+def label_mapping(stage1_results: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Rebuild label_to_model for a stored message, which keeps only the stage results."""
+    return {
+        canonical_label(result["name"]): {
+            "model": result["model"],
+            "name": result["name"],
+            "personality": result.get("personality", "")
+        }
+        for result in stage1_results
+    }
+
+
+def main():
+    """Re-score every stored council answer with a method and print the rankings as JSON lines."""
+    import argparse
+    import json
+    from .storage import create_backend
+
+    parser = argparse.ArgumentParser(description="Re-score stored council answers.")
+    parser.add_argument("--method", choices=METHODS, default="borda")
+    parser.add_argument("--exclude-self-votes", action="store_true")
+    args = parser.parse_args()
+
+    backend = create_backend()
+    for meta in backend.list_conversations():
+        conversation = backend.get_conversation(meta["id"])
+        for index, message in enumerate(conversation["messages"]):
+            if not message.get("stage2"):
+                continue
+            rankings, summary = aggregate(
+                message["stage2"], label_mapping(message.get("stage1") or []),
+                args.method, args.exclude_self_votes
+            )
+            print(json.dumps({
+                "conversation_id": conversation["id"],
+                "message": index,
+                "aggregation": summary,
+                "ranking": [entry["name"] for entry in rankings]
+            }))
+
+
+if __name__ == "__main__":
+    main()
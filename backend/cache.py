@@ -0,0 +1,194 @@
+"""Content-addressed cache for model responses."""
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import List, Dict, Any, Optional
+from .config import (
+    CACHE_ENABLED,
+    CACHE_TTL,
+    CACHE_MAX_ENTRIES,
+    CACHE_DISK_ENABLED,
+    CACHE_DISK_PATH,
+    CACHE_DISK_MAX_ENTRIES,
+)
+
+# Per-request opt-out. Set by the request handlers in main.py and inherited by
+# the tasks they start.
+cache_enabled: ContextVar[bool] = ContextVar("cache_enabled", default=True)
+
+
+def cache_key(model: str, messages: List[Dict[str, Any]], params: Optional[Dict[str, Any]] = None) -> str:
+    """Hash a model id, the full message list and sampling params into a cache key."""
+    canonical = json.dumps(
+        {"model": model, "messages": messages, "params": params or {}},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class MemoryCache:
+    """In-process LRU tier with a TTL."""
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (stored_at, value)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        if time.time() - stored_at > self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Dict[str, Any], stored_at: Optional[float] = None):
+        self._entries[key] = (stored_at or time.time(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DiskCache:
+    """
+    SQLite tier that survives restarts.
+
+    Entries expire after the TTL; once the table grows past max_entries the
+    least recently used rows are evicted.
+    """
+
+    def __init__(self, path: str, max_entries: int, ttl: float):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._local = threading.local()
+        self._writes = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL,"
+                " stored_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[tuple]:
+        """Get (stored_at, value) for a key, or None if missing or expired."""
+        conn = self._connect()
+        row = conn.execute("SELECT value, stored_at FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        value, stored_at = row
+        now = time.time()
+        if now - stored_at > self.ttl:
+            with conn:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            return None
+        with conn:
+            conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+        return stored_at, json.loads(value)
+
+    def set(self, key: str, value: Dict[str, Any]):
+        conn = self._connect()
+        now = time.time()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, stored_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now, now),
+            )
+        self._writes += 1
+        if self._writes % 100 == 0:
+            self.evict()
+
+    def evict(self):
+        """Remove expired rows, then the least recently used rows beyond max_entries."""
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM responses WHERE stored_at < ?", (time.time() - self.ttl,))
+            conn.execute(
+                "DELETE FROM responses WHERE key IN ("
+                " SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def clear(self):
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM responses")
+
+
+class ResponseCache:
+    """Two-tier response cache: memory first, then (optionally) SQLite."""
+
+    def __init__(self, memory: MemoryCache, disk: Optional[DiskCache] = None):
+        self.memory = memory
+        self.disk = disk
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        value = self.memory.get(key)
+        if value is None and self.disk is not None:
+            entry = await asyncio.to_thread(self.disk.get, key)
+            if entry is not None:
+                stored_at, value = entry
+                self.memory.set(key, value, stored_at)
+
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, value: Dict[str, Any]):
+        self.memory.set(key, value)
+        if self.disk is not None:
+            await asyncio.to_thread(self.disk.set, key, value)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "memory_entries": len(self.memory),
+            "disk_enabled": self.disk is not None,
+        }
+
+
+response_cache = ResponseCache(
+    MemoryCache(CACHE_MAX_ENTRIES, CACHE_TTL),
+    DiskCache(CACHE_DISK_PATH, CACHE_DISK_MAX_ENTRIES, CACHE_TTL) if CACHE_DISK_ENABLED else None,
+)
+
+
+def is_enabled() -> bool:
+    """Whether the current request may read from and write to the cache."""
+    return CACHE_ENABLED and cache_enabled.get()
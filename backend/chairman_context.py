@@ -0,0 +1,258 @@
+"""
+Token budgeting of the chairman's stage 3 prompt.
+
+The chairman sees every stage 1 answer and every stage 2 review, so the
+prompt grows with the square of the council size. When the sections do not
+fit the budget, they are compressed in steps, each applied only if the
+previous one was not enough:
+
+    review_rankings  reviewer prose is dropped; the parsed rankings (and
+                     scores of JSON reviews) are kept
+    summaries        answers longer than their share of the budget are
+                     replaced by extractive summaries; better-ranked answers
+                     get larger shares
+    truncated        the lowest-ranked answers are cut to their opening
+                     sentence, then omitted, until the prompt fits
+
+Tokens are estimated at four characters each, which is close enough for
+English text to keep a prompt inside a context window without a tokenizer.
+"""
+
+import re
+from collections import Counter
+from typing import List, Dict, Any, Optional, Tuple
+
+CHARS_PER_TOKEN = 4
+# An answer is never summarized below this, unless it is truncated
+MIN_SUMMARY_TOKENS = 120
+TRUNCATED_TOKENS = 60
+
+_BREAK = re.compile(r"\n\s*\n")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+_WORD = re.compile(r"[a-z][a-z'-]{2,}")
+_STRUCTURE = re.compile(r"^(#{1,6}\s|\*\*[^*]+\*\*:?$|[-*]\s|\d+[.)]\s)")
+STOPWORDS = frozenset(
+    "the and for are but not you all any can had her was one our out has have this that with from they "
+    "will would there their what about which when were been into more than then them these some such "
+    "also its only other should could each may most must very".split()
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of a text."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _units(text: str) -> List[Tuple[int, int, str]]:
+    """Split a text into (paragraph, index in paragraph, unit) sentences and structural lines."""
+    units = []
+    for paragraph, block in enumerate(_BREAK.split(text.strip())):
+        index = 0
+        for line in block.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            pieces = [line] if _STRUCTURE.match(line) else _SENTENCE_END.split(line)
+            for piece in pieces:
+                units.append((paragraph, index, piece))
+                index += 1
+    return units
+
+
+def extractive_summary(text: str, max_tokens: int) -> str:
+    """
+    Shorten a text to about max_tokens by keeping its most central sentences.
+
+    Sentences are scored by how frequent their words are in the whole text,
+    so the ones that carry its main terms win; headings and the first
+    sentence of each paragraph get a bonus. The kept sentences stay in their
+    original order, with paragraph breaks where paragraphs were.
+
+    Args:
+        text: Text to summarize
+        max_tokens: Token budget for the summary
+
+    Returns:
+        The summary, or the text unchanged if it already fits
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    units = _units(text)
+    frequency = Counter(word for _, _, unit in units for word in _WORD.findall(unit.lower()) if word not in STOPWORDS)
+    scored = []
+    for position, (paragraph, index, unit) in enumerate(units):
+        words = set(_WORD.findall(unit.lower())) - STOPWORDS
+        score = sum(frequency[word] for word in words) / (len(words) ** 0.5 if words else 1)
+        if index == 0:
+            score *= 1.5
+        if _STRUCTURE.match(unit) and len(unit) < 80:
+            score *= 2
+        scored.append((score, position))
+
+    budget = max_tokens * CHARS_PER_TOKEN
+    kept = []
+    for _, position in sorted(scored, key=lambda item: (-item[0], item[1])):
+        cost = len(units[position][2]) + 1
+        if cost <= budget:
+            kept.append(position)
+            budget -= cost
+
+    lines, previous = [], None
+    for position in sorted(kept):
+        paragraph, _, unit = units[position]
+        if previous is None or paragraph != previous:
+            lines.append(unit if previous is None else "\n" + unit)
+        else:
+            lines[-1] += " " + unit
+        previous = paragraph
+    return "\n".join(lines)
+
+
+def truncate(text: str, max_tokens: int) -> str:
+    """The opening of a text, cut at a sentence or word boundary, marked as truncated."""
+    limit = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    head = text[:limit]
+    cut = max(head.rfind(". "), head.rfind("\n"))
+    if cut < limit // 2:
+        cut = head.rfind(" ")
+    return head[:cut + 1 if cut > 0 else limit].rstrip() + " [truncated]"
+
+
+def render_stage1(stage1_results: List[Dict[str, Any]], texts: Optional[Dict[str, str]] = None) -> str:
+    """The stage 1 section of the chairman prompt, optionally with replacement texts by member name."""
+    texts = texts or {}
+    return "\n\n".join(
+        f"Model: {result['model']}\nResponse: {texts.get(result['name'], result['response'])}"
+        for result in stage1_results
+    )
+
+
+def render_stage2(stage2_results: List[Dict[str, Any]], rankings_only: bool = False) -> str:
+    """The stage 2 section of the chairman prompt, either full reviews or just the rankings."""
+    if not rankings_only:
+        return "\n\n".join(
+            f"Model: {result['model']}\nRanking: {result['ranking']}"
+            for result in stage2_results
+        )
+    blocks = []
+    for result in stage2_results:
+        scores = result.get("scores") or {}
+        lines = [
+            f"{position}. {label}" + (f" ({scores[label]:g}/10)" if label in scores else "")
+            for position, label in enumerate(result.get("parsed_ranking") or [], start=1)
+        ]
+        blocks.append(f"Model: {result['model']}\nRanking:\n" + "\n".join(lines))
+    return "\n\n".join(blocks)
+
+
+def _shares(tokens: Dict[str, int], order: List[str], available: int) -> Dict[str, int]:
+    """
+    Split a token budget between answers, weighted towards the better ranked.
+
+    Answers shorter than their share keep their full length and the rest of
+    their share goes back to the others.
+    """
+    weights = {name: len(order) - rank for rank, name in enumerate(order)}
+    shares, pending = {}, list(order)
+    while pending:
+        total_weight = sum(weights[name] for name in pending)
+        remaining = available - sum(shares.values())
+        fitting = [name for name in pending if tokens[name] <= remaining * weights[name] / total_weight]
+        if not fitting:
+            for name in pending:
+                shares[name] = max(MIN_SUMMARY_TOKENS, int(remaining * weights[name] / total_weight))
+            break
+        for name in fitting:
+            shares[name] = tokens[name]
+            pending.remove(name)
+    return shares
+
+
+def fit_sections(
+    stage1_results: List[Dict[str, Any]],
+    stage2_results: List[Dict[str, Any]],
+    order: List[str],
+    budget: int,
+    fixed_tokens: int = 0
+) -> Tuple[str, str, Dict[str, Any]]:
+    """
+    Render the stage 1 and stage 2 sections of the chairman prompt within a token budget.
+
+    Args:
+        stage1_results: Individual responses from stage 1
+        stage2_results: Reviews from stage 2
+        order: Member names, best ranked first; members missing from it rank last
+        budget: Token budget for the whole prompt, 0 for no limit
+        fixed_tokens: Tokens of the rest of the prompt (template and question)
+
+    Returns:
+        Tuple of (stage1_text, stage2_text, report). The report has the
+        'strategy' (the last step applied, "full" if none), the 'steps' taken,
+        the 'budget', the 'original_tokens' and final 'tokens' of the prompt,
+        and how each member's answer was 'treated' (full, summary, truncated
+        or omitted).
+    """
+    stage1_text = render_stage1(stage1_results)
+    stage2_text = render_stage2(stage2_results)
+    original = fixed_tokens + estimate_tokens(stage1_text) + estimate_tokens(stage2_text)
+    names = [result["name"] for result in stage1_results]
+    order = [name for name in order if name in names] + [name for name in names if name not in order]
+    treated = {name: "full" for name in names}
+    report = {"strategy": "full", "steps": [], "budget": budget, "original_tokens": original}
+
+    def total() -> int:
+        return fixed_tokens + estimate_tokens(stage1_text) + estimate_tokens(stage2_text)
+
+    def finish():
+        report["tokens"] = total()
+        report["treated"] = treated
+        return stage1_text, stage2_text, report
+
+    if not budget or original <= budget:
+        return finish()
+
+    # Reviewer prose goes first: the rankings carry what synthesis needs from stage 2
+    stage2_text = render_stage2(stage2_results, rankings_only=True)
+    report["steps"].append("review_rankings")
+    if total() <= budget:
+        report["strategy"] = "review_rankings"
+        return finish()
+
+    # Summaries sized by rank; the per-answer framing ("Model: ...") counts as overhead
+    answers = {result["name"]: result["response"] for result in stage1_results}
+    framing = estimate_tokens(render_stage1(stage1_results, {name: "" for name in names}))
+    available = budget - fixed_tokens - estimate_tokens(stage2_text) - framing
+    shares = _shares({name: estimate_tokens(text) for name, text in answers.items()}, order, available)
+    texts = {}
+    for name in order:
+        texts[name] = extractive_summary(answers[name], shares[name])
+        if texts[name] != answers[name]:
+            treated[name] = "summary"
+    stage1_text = render_stage1(stage1_results, texts)
+    report["steps"].append("summaries")
+    report["strategy"] = "summaries"
+    if total() <= budget:
+        return finish()
+
+    # Lowest ranked first: cut to the opening, then leave out entirely
+    report["steps"].append("truncated")
+    report["strategy"] = "truncated"
+    for treatment in ("truncated", "omitted"):
+        for rank in range(len(order) - 1, 0, -1):
+            name = order[rank]
+            if treatment == "truncated":
+                text = truncate(answers[name], TRUNCATED_TOKENS)
+                # Answers already shorter than the cut are left as they are
+                if text == answers[name]:
+                    continue
+                texts[name] = text
+            else:
+                texts[name] = f"[Omitted to fit the context budget; ranked {rank + 1} of {len(order)}]"
+            treated[name] = treatment
+            stage1_text = render_stage1(stage1_results, texts)
+            if total() <= budget:
+                return finish()
+    return finish()
@@ -7,10 +7,85 @@ from .personas import DEFAULT_COUNCIL, DEFAULT_CHAIRMAN
 load_dotenv()
 
 OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY")
-OPENROUTER_API_URL = "https://openrouter.ai/api/v1/chat/completions"
+OPENROUTER_API_URL = os.getenv("OPENROUTER_API_URL", "https://openrouter.ai/api/v1/chat/completions")
 
 # Default council and chairman (for backward compatibility)
 COUNCIL_MODELS = DEFAULT_COUNCIL
 CHAIRMAN = DEFAULT_CHAIRMAN
 
-DATA_DIR = "data/conversations"
\ No newline at end of file
+DATA_DIR = "data/conversations"
+
+# Conversation storage backend: "sqlite" (default), "jsonl" (append-only journal
+# per conversation) or "json" (one document per conversation).
+# A new SQLite database imports any existing JSON conversations on first start.
+STORAGE_BACKEND = os.getenv("CIPHER_STORAGE_BACKEND", "sqlite")
+STORAGE_SQLITE_PATH = os.getenv("CIPHER_STORAGE_SQLITE_PATH", "data/conversations.sqlite3")
+JOURNAL_COMPACT_AFTER = int(os.getenv("CIPHER_JOURNAL_COMPACT_AFTER", "50"))  # records before a snapshot
+# Large messages are stored compressed: "zstd" (falls back to gzip without zstandard), "gzip" or "none"
+STORAGE_COMPRESSION = os.getenv("CIPHER_STORAGE_COMPRESSION", "zstd")
+STORAGE_COMPRESS_MIN_BYTES = int(os.getenv("CIPHER_STORAGE_COMPRESS_MIN_BYTES", "16384"))
+
+# Shared HTTP client for OpenRouter (one pool for the whole process)
+HTTP2_ENABLED = os.getenv("CIPHER_HTTP2", "1") != "0"
+HTTP_MAX_CONNECTIONS = int(os.getenv("CIPHER_HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("CIPHER_HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("CIPHER_HTTP_KEEPALIVE_EXPIRY", "60"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("CIPHER_HTTP_CONNECT_TIMEOUT", "10"))
+
+# Pipelined council: seconds to wait for the stage 1 quorum before reviews start
+PIPELINE_STAGE1_DEADLINE = float(os.getenv("CIPHER_PIPELINE_STAGE1_DEADLINE", "30"))
+
+# Stage 2 review format: "text" (written reviews ending in FINAL RANKING) or
+# "json" (structured scores and ordering, text parser as fallback)
+REVIEW_FORMAT = os.getenv("CIPHER_REVIEW_FORMAT", "text")
+
+# Default method for combining stage 2 reviews: "mean", "borda", "copeland",
+# "kemeny" or "weighted" (see backend/aggregation.py)
+AGGREGATION_METHOD = os.getenv("CIPHER_AGGREGATION_METHOD", "mean")
+
+# Stage 2 early exit: "off" waits for every review; "certain" stops once the
+# leader under the aggregation method can no longer be overtaken ("stable" for
+# "weighted"), "stable" once it almost surely won't be
+# (see aggregation.settled_leader). Only councils of at least
+# STAGE2_EARLY_EXIT_MIN_MEMBERS members stop early.
+STAGE2_EARLY_EXIT = os.getenv("CIPHER_STAGE2_EARLY_EXIT", "off")
+STAGE2_EARLY_EXIT_MIN_MEMBERS = int(os.getenv("CIPHER_STAGE2_EARLY_EXIT_MIN_MEMBERS", "4"))
+
+# Token budget for the chairman's stage 3 prompt (0 = unlimited). Over budget,
+# reviews are reduced to their rankings and answers summarized or truncated
+# (see backend/chairman_context.py).
+CHAIRMAN_CONTEXT_BUDGET = int(os.getenv("CIPHER_CHAIRMAN_CONTEXT_BUDGET", "24000"))
+
+# Tail-latency control for council and debate calls
+STAGE_DEADLINE = float(os.getenv("CIPHER_STAGE_DEADLINE", "150"))  # seconds per stage
+HEDGE_AFTER = float(os.getenv("CIPHER_HEDGE_AFTER", "25"))  # used until enough latency samples exist
+HEDGE_MIN_SAMPLES = int(os.getenv("CIPHER_HEDGE_MIN_SAMPLES", "20"))
+HEDGE_PERCENTILE = float(os.getenv("CIPHER_HEDGE_PERCENTILE", "0.9"))
+
+# Retries for transient upstream failures (429, 5xx, connection errors)
+RETRY_ATTEMPTS = int(os.getenv("CIPHER_RETRY_ATTEMPTS", "3"))
+RETRY_BASE_DELAY = float(os.getenv("CIPHER_RETRY_BASE_DELAY", "0.5"))
+RETRY_MAX_DELAY = float(os.getenv("CIPHER_RETRY_MAX_DELAY", "8"))
+RETRY_AFTER_MAX = float(os.getenv("CIPHER_RETRY_AFTER_MAX", "30"))  # cap on honoured Retry-After
+
+# Per-model request rate limit shared by all conversations (0 disables it)
+MODEL_RATE_LIMIT = float(os.getenv("CIPHER_MODEL_RATE_LIMIT", "5"))  # requests per second
+MODEL_RATE_BURST = float(os.getenv("CIPHER_MODEL_RATE_BURST", "10"))
+
+# Upstream concurrency bounds enforced by the scheduler in openrouter.py
+MAX_UPSTREAM_CONCURRENCY = int(os.getenv("CIPHER_MAX_UPSTREAM_CONCURRENCY", "32"))
+MAX_MODEL_CONCURRENCY = int(os.getenv("CIPHER_MAX_MODEL_CONCURRENCY", "8"))
+
+# Response cache in front of query_model (memory LRU, optional SQLite tier)
+CACHE_ENABLED = os.getenv("CIPHER_CACHE", "1") != "0"
+CACHE_TTL = float(os.getenv("CIPHER_CACHE_TTL", "3600"))
+CACHE_MAX_ENTRIES = int(os.getenv("CIPHER_CACHE_MAX_ENTRIES", "1000"))
+CACHE_DISK_ENABLED = os.getenv("CIPHER_CACHE_DISK", "0") != "0"
+CACHE_DISK_PATH = os.getenv("CIPHER_CACHE_DISK_PATH", "data/cache/responses.sqlite3")
+CACHE_DISK_MAX_ENTRIES = int(os.getenv("CIPHER_CACHE_DISK_MAX_ENTRIES", "50000"))
+
+# Provider prompt caching: stage 2 puts the shared responses block first so it
+# can be reused across reviewers. Providers listed here only cache at explicit
+# cache_control breakpoints; others (OpenAI, DeepSeek, Grok) cache prefixes automatically.
+PROMPT_CACHE_HINTS = os.getenv("CIPHER_PROMPT_CACHE_HINTS", "1") != "0"
+PROMPT_CACHE_HINT_PROVIDERS = ("anthropic/", "google/gemini")
@@ -5,8 +5,12 @@ Debaters are professional cybersecurity personas with distinct rhetorical styles
 """
 
 import asyncio
-from typing import List, Dict, Any, Optional
-from .openrouter import query_model
+from typing import List, Dict, Any, Optional, Callable
+from .openrouter import query_model_chain, PRIORITY_INTERACTIVE
+from .config import STAGE_DEADLINE
+from .personas import get_model_chain
+from .telemetry import call_telemetry, summarize_stage, summarize_run
+from . import metrics
 
 
 def build_side_system_message(persona: Dict[str, Any], side: str, topic: str) -> str:
@@ -25,9 +29,38 @@ def build_side_system_message(persona: Dict[str, Any], side: str, topic: str) ->
     return base + side_instruction + "\n\nKeep your responses concise but impactful — aim for 2-4 paragraphs per response."
 
 
+def _delta_emitter(
+    on_event: Optional[Callable[[Dict[str, Any]], None]],
+    event_type: str,
+    debater: Dict[str, Any],
+    **extra: Any
+) -> Optional[Callable[[str, bool], None]]:
+    """Build an on_delta callback that tags each chunk with the debater producing it (and flags restarts)."""
+    if on_event is None:
+        return None
+
+    def emit(chunk: str, restart: bool = False):
+        event = {
+            "type": event_type,
+            "persona": debater["name"],
+            "persona_id": debater.get("id", ""),
+            "model": debater["model"],
+            "side": debater.get("side", ""),
+            "title": debater.get("title", ""),
+            **extra,
+            "delta": chunk
+        }
+        if restart:
+            event["restart"] = True
+        on_event(event)
+
+    return emit
+
+
 async def collect_opening_statements(
     topic: str,
-    debaters: List[Dict[str, Any]]
+    debaters: List[Dict[str, Any]],
+    on_event: Optional[Callable[[Dict[str, Any]], None]] = None
 ) -> List[Dict[str, Any]]:
     """
     Collect opening statements from all debaters in parallel.
@@ -35,9 +68,10 @@ async def collect_opening_statements(
     Args:
         topic: The debate topic/question
         debaters: List of debater configs with name, model, system_message, side
+        on_event: Optional callback for 'opening_delta' events. When given, statements are streamed.
 
     Returns:
-        List of opening statements: [{persona, model, side, content}, ...]
+        List of opening statements: [{persona, model, side, content, timing, usage}, ...]
     """
     async def get_opening(debater: Dict[str, Any]) -> Dict[str, Any]:
         system_message = build_side_system_message(debater, debater["side"], topic)
@@ -52,15 +86,19 @@ async def collect_opening_statements(
             {"role": "user", "content": prompt}
         ]
 
-        result = await query_model(debater["model"], messages)
+        on_delta = _delta_emitter(on_event, "opening_delta", debater)
+        result = await query_model_chain(
+            get_model_chain(debater), messages, on_delta=on_delta, deadline=STAGE_DEADLINE
+        )
 
         return {
             "persona": debater["name"],
             "persona_id": debater.get("id", ""),
-            "model": debater["model"],
+            "model": result["model"] if result else debater["model"],
             "side": debater["side"],
             "title": debater.get("title", ""),
-            "content": result["content"] if result else "Failed to generate opening statement."
+            "content": result["content"] if result else "Failed to generate opening statement.",
+            **(call_telemetry(result) if result else {})
         }
 
     tasks = [get_opening(debater) for debater in debaters]
@@ -71,7 +109,8 @@ async def collect_round_responses(
     topic: str,
     debaters: List[Dict[str, Any]],
     previous_statements: List[Dict[str, Any]],
-    round_number: int
+    round_number: int,
+    on_event: Optional[Callable[[Dict[str, Any]], None]] = None
 ) -> List[Dict[str, Any]]:
     """
     Collect responses for a debate round where each debater responds to opponents.
@@ -81,9 +120,10 @@ async def collect_round_responses(
         debaters: List of debater configs (with side)
         previous_statements: Statements from the previous round
         round_number: Current round (1-indexed)
+        on_event: Optional callback for 'round_delta' events. When given, responses are streamed.
 
     Returns:
-        List of round responses: [{persona, model, side, content}, ...]
+        List of round responses: [{persona, model, side, content, timing, usage}, ...]
     """
     async def get_response(debater: Dict[str, Any], opponent_statements: List[Dict[str, Any]]) -> Dict[str, Any]:
         system_message = build_side_system_message(debater, debater["side"], topic)
@@ -107,15 +147,19 @@ async def collect_round_responses(
             {"role": "user", "content": prompt}
         ]
 
-        result = await query_model(debater["model"], messages)
+        on_delta = _delta_emitter(on_event, "round_delta", debater, round=round_number)
+        result = await query_model_chain(
+            get_model_chain(debater), messages, on_delta=on_delta, deadline=STAGE_DEADLINE
+        )
 
         return {
             "persona": debater["name"],
             "persona_id": debater.get("id", ""),
-            "model": debater["model"],
+            "model": result["model"] if result else debater["model"],
             "side": debater["side"],
             "title": debater.get("title", ""),
-            "content": result["content"] if result else "Failed to generate response."
+            "content": result["content"] if result else "Failed to generate response.",
+            **(call_telemetry(result) if result else {})
         }
 
     tasks = [get_response(debater, previous_statements) for debater in debaters]
@@ -126,7 +170,8 @@ async def generate_verdict(
     topic: str,
     openings: List[Dict[str, Any]],
     rounds: List[List[Dict[str, Any]]],
-    moderator: Dict[str, Any]
+    moderator: Dict[str, Any],
+    on_event: Optional[Callable[[Dict[str, Any]], None]] = None
 ) -> Dict[str, Any]:
     """
     Generate a moderator verdict summarizing the debate.
@@ -136,9 +181,10 @@ async def generate_verdict(
         openings: Opening statements
         rounds: All debate rounds
         moderator: Moderator config with name, model, system_message
+        on_event: Optional callback for 'verdict_delta' events. When given, the verdict is streamed.
 
     Returns:
-        Verdict: {moderator, model, content}
+        Verdict: {moderator, model, content, timing, usage}
     """
     # Build full transcript
     transcript = "## Opening Statements\n\n"
@@ -170,10 +216,57 @@ async def generate_verdict(
         {"role": "user", "content": prompt}
     ]
 
-    result = await query_model(moderator["model"], messages)
+    on_delta = None
+    if on_event is not None:
+        def on_delta(chunk: str, restart: bool = False):
+            event = {
+                "type": "verdict_delta",
+                "moderator": moderator["name"],
+                "model": moderator["model"],
+                "delta": chunk
+            }
+            if restart:
+                event["restart"] = True
+            on_event(event)
+
+    result = await query_model_chain(
+        get_model_chain(moderator), messages, on_delta=on_delta, deadline=STAGE_DEADLINE,
+        priority=PRIORITY_INTERACTIVE
+    )
 
     return {
         "moderator": moderator["name"],
-        "model": moderator["model"],
-        "content": result["content"] if result else "Failed to generate verdict."
+        "model": result["model"] if result else moderator["model"],
+        "content": result["content"] if result else "Failed to generate verdict.",
+        **(call_telemetry(result) if result else {})
     }
+
+
+def debate_stats(
+    openings: List[Dict[str, Any]],
+    rounds: List[List[Dict[str, Any]]],
+    verdict: Optional[Dict[str, Any]],
+    durations: Dict[str, float],
+    total_duration: float
+) -> Dict[str, Any]:
+    """
+    Summarize timing, tokens and cost per phase for a debate.
+
+    Args:
+        openings: Opening statements
+        rounds: All debate rounds
+        verdict: Optional moderator verdict
+        durations: Wall-clock seconds per phase ('openings', 'round_1', ..., 'verdict')
+        total_duration: Wall-clock seconds of the whole debate
+
+    Returns:
+        Dict with 'stages' and 'total'
+    """
+    metrics.observe_stages("debate", durations)
+    stages = {"openings": summarize_stage(openings, durations.get("openings"))}
+    for round_number, round_responses in enumerate(rounds, 1):
+        name = f"round_{round_number}"
+        stages[name] = summarize_stage(round_responses, durations.get(name))
+    if verdict is not None:
+        stages["verdict"] = summarize_stage([verdict], durations.get("verdict"))
+    return summarize_run(stages, total_duration)
@@ -1,20 +1,32 @@
 """FastAPI backend for Cipher."""
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import StreamingResponse, PlainTextResponse
 from pydantic import BaseModel
-from typing import List, Dict, Any
+from typing import List, Dict, Any, AsyncIterator, Literal, Optional
+from contextlib import asynccontextmanager
 import uuid
 import json
 import asyncio
+import time
 
-from . import storage
-from .council import run_full_council, generate_conversation_title, stage1_collect_responses, stage2_collect_rankings, stage3_synthesize_final, calculate_aggregate_rankings
-from .debate import collect_opening_statements, collect_round_responses, generate_verdict
+from . import storage, openrouter, cache, metrics
+from .council import run_full_council, generate_conversation_title, stage1_collect_responses, stage2_collect_rankings, stage3_synthesize_final, calculate_aggregate_rankings, collect_stages_pipelined, council_stats
+from .debate import collect_opening_statements, collect_round_responses, generate_verdict, debate_stats
+from .telemetry import summarize_stage
 from .personas import get_personas_by_category, get_all_chairmen, get_persona_by_name, get_chairman_by_name, get_all_debate_personas, get_debate_persona_by_id, get_all_debate_moderators, get_debate_moderator_by_id
 
-app = FastAPI(title="Cipher API")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open the shared OpenRouter client on startup and close it on shutdown."""
+    await openrouter.init_client()
+    yield
+    await openrouter.close_client()
+
+
+app = FastAPI(title="Cipher API", lifespan=lifespan)
 
 # Enable CORS for local development
 app.add_middleware(
@@ -41,6 +53,15 @@ class SendMessageRequest(BaseModel):
     debater_against: str = None  # Debate persona ID for AGAINST side
     num_rounds: int = None  # Number of debate rounds
     moderator: str = None  # Moderator/chairman name
+    # Council orchestration
+    orchestration: Literal["sequential", "pipelined"] = "sequential"
+    quorum: Optional[int] = None  # Pipelined mode: stage 1 responses needed before reviews start
+    stage1_deadline: Optional[float] = None  # Pipelined mode: seconds to wait for the quorum
+    review_format: Optional[Literal["text", "json"]] = None  # Stage 2 reviews; None uses CIPHER_REVIEW_FORMAT
+    aggregation: Optional[Literal["mean", "borda", "copeland", "kemeny", "weighted"]] = None  # None uses CIPHER_AGGREGATION_METHOD
+    exclude_self_votes: bool = False  # Ignore reviewers' votes on their own responses
+    early_exit: Optional[Literal["off", "certain", "stable"]] = None  # Stage 2 early exit; None uses CIPHER_STAGE2_EARLY_EXIT
+    use_cache: bool = True  # Allow answers from the response cache
 
 
 class ConversationMetadata(BaseModel):
@@ -53,11 +74,70 @@ class ConversationMetadata(BaseModel):
 
 
 class Conversation(BaseModel):
-    """Full conversation with all messages."""
+    """Conversation with all messages, or a range of them."""
     id: str
     created_at: str
     title: str
     messages: List[Dict[str, Any]]
+    message_count: Optional[int] = None  # total, when only a range is returned
+    offset: int = 0  # index of the first message returned
+
+
+def project_message(message: Dict[str, Any], exclude: List[str]) -> Dict[str, Any]:
+    """
+    Drop fields from a message.
+
+    Args:
+        message: Stored message
+        exclude: Field paths such as "stage1" or "stage2.ranking"; a nested
+            path applies to every item of a list field
+
+    Returns:
+        A copy of the message without the excluded fields
+    """
+    projected = dict(message)
+    for path in exclude:
+        field, _, nested = path.partition(".")
+        if field not in projected:
+            continue
+        if not nested:
+            del projected[field]
+            continue
+        value = projected[field]
+        if isinstance(value, list):
+            projected[field] = [
+                {k: v for k, v in item.items() if k != nested} if isinstance(item, dict) else item
+                for item in value
+            ]
+        elif isinstance(value, dict):
+            projected[field] = {k: v for k, v in value.items() if k != nested}
+    return projected
+
+
+async def drain_events(
+    task: "asyncio.Task",
+    events: "asyncio.Queue[Dict[str, Any]]"
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Yield events queued by a running stage until the stage task finishes.
+
+    The task is cancelled if the consumer stops early (e.g. the client disconnects).
+    """
+    try:
+        while not task.done():
+            getter = asyncio.ensure_future(events.get())
+            await asyncio.wait({task, getter}, return_when=asyncio.FIRST_COMPLETED)
+            if getter.done():
+                yield getter.result()
+            else:
+                getter.cancel()
+
+        # Flush anything emitted right before the task finished
+        while not events.empty():
+            yield events.get_nowait()
+    finally:
+        if not task.done():
+            task.cancel()
 
 
 @app.get("/")
@@ -67,25 +147,51 @@ async def root():
 
 
 @app.get("/api/conversations", response_model=List[ConversationMetadata])
-async def list_conversations():
-    """List all conversations (metadata only)."""
-    return storage.list_conversations()
+async def list_conversations(
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    before: Optional[str] = None,
+):
+    """
+    List conversations (metadata only), newest first.
+
+    Pass the id of the last conversation on a page as `before` to fetch the
+    next page.
+    """
+    try:
+        return await storage.list_conversations(limit, before)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @app.post("/api/conversations", response_model=Conversation)
 async def create_conversation(request: CreateConversationRequest):
     """Create a new conversation."""
     conversation_id = str(uuid.uuid4())
-    conversation = storage.create_conversation(conversation_id)
+    conversation = await storage.create_conversation(conversation_id)
     return conversation
 
 
 @app.get("/api/conversations/{conversation_id}", response_model=Conversation)
-async def get_conversation(conversation_id: str):
-    """Get a specific conversation with all its messages."""
-    conversation = storage.get_conversation(conversation_id)
+async def get_conversation(
+    conversation_id: str,
+    last: Optional[int] = Query(None, ge=0),
+    after: Optional[int] = Query(None, ge=-1),
+    before: Optional[int] = Query(None, ge=0),
+    exclude: Optional[str] = None,
+):
+    """
+    Get a specific conversation with all its messages, or a range of them.
+
+    `last=N` returns the latest N messages, `after`/`before` bound the range
+    by message index, and `exclude` is a comma-separated list of fields to
+    drop from each message (e.g. `stage2.ranking`).
+    """
+    conversation = await storage.get_messages(conversation_id, after, before, last)
     if conversation is None:
         raise HTTPException(status_code=404, detail="Conversation not found")
+    if exclude:
+        fields = [field.strip() for field in exclude.split(",") if field.strip()]
+        conversation["messages"] = [project_message(m, fields) for m in conversation["messages"]]
     return conversation
 
 
@@ -108,27 +214,85 @@ async def get_debate_personas():
     }
 
 
+@app.get("/api/scheduler")
+async def get_scheduler_stats():
+    """Upstream scheduler queue depth, in-flight calls and queue wait times."""
+    return openrouter.scheduler.stats()
+
+
+# Point-in-time values sampled on each scrape
+metrics.registry.register(metrics.CallbackMetric(
+    "cipher_upstream_in_flight",
+    "Upstream model requests currently holding a scheduler slot.",
+    lambda: {(): openrouter.scheduler.stats()["in_flight"]},
+))
+metrics.registry.register(metrics.CallbackMetric(
+    "cipher_upstream_queue_depth",
+    "Upstream model requests waiting for a scheduler slot.",
+    lambda: {(): openrouter.scheduler.stats()["queue_depth"]},
+))
+metrics.registry.register(metrics.CallbackMetric(
+    "cipher_upstream_coalesced_total",
+    "Model calls answered by joining an identical in-flight call.",
+    lambda: {(): openrouter.single_flight.coalesced_total},
+    type_name="counter",
+))
+metrics.registry.register(metrics.CallbackMetric(
+    "cipher_cache_lookups_total",
+    "Response cache lookups by result.",
+    lambda: {("hit",): cache.response_cache.hits, ("miss",): cache.response_cache.misses},
+    labels=["result"],
+    type_name="counter",
+))
+metrics.registry.register(metrics.CallbackMetric(
+    "cipher_cache_hit_ratio",
+    "Response cache hits divided by lookups since startup.",
+    lambda: {(): cache.response_cache.stats()["hit_ratio"]},
+))
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Prometheus metrics in the text exposition format."""
+    return PlainTextResponse(metrics.registry.render(), media_type="text/plain; version=0.0.4")
+
+
+async def timed_stream(events: AsyncIterator[str], mode: str) -> AsyncIterator[str]:
+    """Pass an SSE stream through, recording its duration and error events."""
+    started = time.perf_counter()
+    try:
+        async for chunk in events:
+            if chunk.startswith('data: {"type": "error"'):
+                metrics.SSE_STREAM_ERRORS.inc(mode=mode)
+            yield chunk
+    finally:
+        metrics.SSE_STREAM_SECONDS.observe(time.perf_counter() - started, mode=mode)
+
+
 @app.post("/api/conversations/{conversation_id}/message")
 async def send_message(conversation_id: str, request: SendMessageRequest):
     """
     Send a message and run the 3-stage council process.
     Returns the complete response with all stages.
     """
+    openrouter.current_conversation.set(conversation_id)
+    cache.cache_enabled.set(request.use_cache)
+
     # Check if conversation exists
-    conversation = storage.get_conversation(conversation_id)
+    conversation = await storage.get_messages(conversation_id, last=0)
     if conversation is None:
         raise HTTPException(status_code=404, detail="Conversation not found")
 
     # Check if this is the first message
-    is_first_message = len(conversation["messages"]) == 0
+    is_first_message = conversation["message_count"] == 0
 
     # Add user message
-    storage.add_user_message(conversation_id, request.content)
+    await storage.add_user_message(conversation_id, request.content)
 
     # If this is the first message, generate a title
     if is_first_message:
         title = await generate_conversation_title(request.content)
-        storage.update_conversation_title(conversation_id, title)
+        await storage.update_conversation_title(conversation_id, title)
 
     # Build council and chairman from request or use defaults
     council_models = None
@@ -148,15 +312,23 @@ async def send_message(conversation_id: str, request: SendMessageRequest):
     stage1_results, stage2_results, stage3_result, metadata = await run_full_council(
         request.content,
         council_models,
-        chairman_config
+        chairman_config,
+        orchestration=request.orchestration,
+        quorum=request.quorum,
+        deadline=request.stage1_deadline,
+        review_format=request.review_format,
+        aggregation=request.aggregation,
+        exclude_self_votes=request.exclude_self_votes,
+        early_exit=request.early_exit
     )
 
     # Add assistant message with all stages
-    storage.add_assistant_message(
+    await storage.add_assistant_message(
         conversation_id,
         stage1_results,
         stage2_results,
-        stage3_result
+        stage3_result,
+        metadata.get("stats")
     )
 
     # Return the complete response with metadata
@@ -175,20 +347,22 @@ async def send_message_stream(conversation_id: str, request: SendMessageRequest)
     Returns Server-Sent Events as each stage completes.
     """
     # Check if conversation exists
-    conversation = storage.get_conversation(conversation_id)
+    conversation = await storage.get_messages(conversation_id, last=0)
     if conversation is None:
         raise HTTPException(status_code=404, detail="Conversation not found")
 
     # Check if this is the first message
-    is_first_message = len(conversation["messages"]) == 0
+    is_first_message = conversation["message_count"] == 0
 
     is_debate = request.debater_for is not None and request.debater_against is not None
 
     async def council_event_generator():
         """Handle council mode - 3-stage deliberation process."""
+        openrouter.current_conversation.set(conversation_id)
+        cache.cache_enabled.set(request.use_cache)
         try:
             # Add user message
-            storage.add_user_message(conversation_id, request.content)
+            await storage.add_user_message(conversation_id, request.content)
 
             # Start title generation in parallel (don't await yet)
             title_task = None
@@ -209,42 +383,94 @@ async def send_message_stream(conversation_id: str, request: SendMessageRequest)
             if request.chairman:
                 chairman_config = get_chairman_by_name(request.chairman)
 
-            # Stage 1: Collect responses
-            yield f"data: {json.dumps({'type': 'stage1_start'})}\n\n"
-            stage1_results = await stage1_collect_responses(request.content, council_models)
-            yield f"data: {json.dumps({'type': 'stage1_complete', 'data': stage1_results})}\n\n"
-
-            # Stage 2: Collect rankings
-            yield f"data: {json.dumps({'type': 'stage2_start'})}\n\n"
-            stage2_results, label_to_model = await stage2_collect_rankings(
-                request.content, stage1_results, council_models
+            events = asyncio.Queue()
+            started = time.perf_counter()
+            stage_durations = {}
+            early_exit = None
+
+            if request.orchestration == "pipelined":
+                # Stages 1 and 2 overlap: reviews start once the stage 1 quorum is in
+                yield f"data: {json.dumps({'type': 'stage1_start'})}\n\n"
+                stages_task = asyncio.create_task(collect_stages_pipelined(
+                    request.content, council_models, request.quorum, request.stage1_deadline,
+                    on_event=events.put_nowait, review_format=request.review_format,
+                    early_exit=request.early_exit, aggregation=request.aggregation,
+                    exclude_self_votes=request.exclude_self_votes
+                ))
+                async for event in drain_events(stages_task, events):
+                    if event["type"] == "stage2_early_exit":
+                        early_exit = event
+                    yield f"data: {json.dumps(event)}\n\n"
+                stage1_results, stage2_results, label_to_model = stages_task.result()
+                yield f"data: {json.dumps({'type': 'stage1_complete', 'data': stage1_results, 'stats': summarize_stage(stage1_results)})}\n\n"
+            else:
+                # Stage 1: Collect responses (token deltas and finished members are streamed as they arrive)
+                yield f"data: {json.dumps({'type': 'stage1_start'})}\n\n"
+                stage1_task = asyncio.create_task(
+                    stage1_collect_responses(request.content, council_models, on_event=events.put_nowait)
+                )
+                async for event in drain_events(stage1_task, events):
+                    yield f"data: {json.dumps(event)}\n\n"
+                stage1_results = stage1_task.result()
+                stage_durations["stage1"] = time.perf_counter() - started
+                yield f"data: {json.dumps({'type': 'stage1_complete', 'data': stage1_results, 'stats': summarize_stage(stage1_results, stage_durations['stage1'])})}\n\n"
+
+                # Stage 2: Collect rankings
+                stage2_started = time.perf_counter()
+                yield f"data: {json.dumps({'type': 'stage2_start'})}\n\n"
+                stage2_task = asyncio.create_task(stage2_collect_rankings(
+                    request.content, stage1_results, council_models, on_event=events.put_nowait,
+                    review_format=request.review_format, early_exit=request.early_exit,
+                    aggregation=request.aggregation, exclude_self_votes=request.exclude_self_votes
+                ))
+                async for event in drain_events(stage2_task, events):
+                    if event["type"] == "stage2_early_exit":
+                        early_exit = event
+                    yield f"data: {json.dumps(event)}\n\n"
+                stage2_results, label_to_model = stage2_task.result()
+                stage_durations["stage2"] = time.perf_counter() - stage2_started
+
+            aggregate_rankings, aggregation = calculate_aggregate_rankings(
+                stage2_results, label_to_model, request.aggregation, request.exclude_self_votes
             )
-            aggregate_rankings = calculate_aggregate_rankings(stage2_results, label_to_model)
-            yield f"data: {json.dumps({'type': 'stage2_complete', 'data': stage2_results, 'metadata': {'label_to_model': label_to_model, 'aggregate_rankings': aggregate_rankings}})}\n\n"
+            stage2_stats = summarize_stage(stage2_results, stage_durations.get("stage2"))
+            yield f"data: {json.dumps({'type': 'stage2_complete', 'data': stage2_results, 'metadata': {'label_to_model': label_to_model, 'aggregate_rankings': aggregate_rankings, 'aggregation': aggregation, 'early_exit': early_exit}, 'stats': stage2_stats})}\n\n"
 
             # Stage 3: Synthesize final answer
+            stage3_started = time.perf_counter()
             yield f"data: {json.dumps({'type': 'stage3_start'})}\n\n"
-            stage3_result = await stage3_synthesize_final(
-                request.content, stage1_results, stage2_results, chairman_config
-            )
-            yield f"data: {json.dumps({'type': 'stage3_complete', 'data': stage3_result})}\n\n"
+            stage3_task = asyncio.create_task(stage3_synthesize_final(
+                request.content, stage1_results, stage2_results, chairman_config,
+                on_event=events.put_nowait, aggregate_rankings=aggregate_rankings
+            ))
+            async for event in drain_events(stage3_task, events):
+                yield f"data: {json.dumps(event)}\n\n"
+            stage3_result = stage3_task.result()
+            stage_durations["stage3"] = time.perf_counter() - stage3_started
+            yield f"data: {json.dumps({'type': 'stage3_complete', 'data': stage3_result, 'stats': summarize_stage([stage3_result], stage_durations['stage3'])})}\n\n"
 
             # Wait for title generation if it was started
             if title_task:
                 title = await title_task
-                storage.update_conversation_title(conversation_id, title)
+                await storage.update_conversation_title(conversation_id, title)
                 yield f"data: {json.dumps({'type': 'title_complete', 'data': {'title': title}})}\n\n"
 
+            stats = council_stats(
+                stage1_results, stage2_results, stage3_result,
+                stage_durations, time.perf_counter() - started
+            )
+
             # Save complete assistant message
-            storage.add_assistant_message(
+            await storage.add_assistant_message(
                 conversation_id,
                 stage1_results,
                 stage2_results,
-                stage3_result
+                stage3_result,
+                stats
             )
 
             # Send completion event
-            yield f"data: {json.dumps({'type': 'complete'})}\n\n"
+            yield f"data: {json.dumps({'type': 'complete', 'stats': stats})}\n\n"
 
         except Exception as e:
             # Send error event
@@ -252,9 +478,11 @@ async def send_message_stream(conversation_id: str, request: SendMessageRequest)
 
     async def debate_event_generator():
         """Handle debate mode - two personas debate FOR vs AGAINST."""
+        openrouter.current_conversation.set(conversation_id)
+        cache.cache_enabled.set(request.use_cache)
         try:
             # Add user message (the debate topic)
-            storage.add_user_message(conversation_id, request.content)
+            await storage.add_user_message(conversation_id, request.content)
 
             # Start title generation in parallel
             title_task = None
@@ -278,19 +506,37 @@ async def send_message_stream(conversation_id: str, request: SendMessageRequest)
                 {**against_persona, "side": "against"},
             ]
 
+            events = asyncio.Queue()
+            started = time.perf_counter()
+            durations = {}
+
             # Opening statements
             yield f"data: {json.dumps({'type': 'openings_start'})}\n\n"
-            openings = await collect_opening_statements(request.content, debaters)
-            yield f"data: {json.dumps({'type': 'openings_complete', 'data': openings})}\n\n"
+            openings_task = asyncio.create_task(
+                collect_opening_statements(request.content, debaters, on_event=events.put_nowait)
+            )
+            async for event in drain_events(openings_task, events):
+                yield f"data: {json.dumps(event)}\n\n"
+            openings = openings_task.result()
+            durations["openings"] = time.perf_counter() - started
+            yield f"data: {json.dumps({'type': 'openings_complete', 'data': openings, 'stats': summarize_stage(openings, durations['openings'])})}\n\n"
 
             # Debate rounds
             rounds = []
             previous = openings
             for round_num in range(1, num_rounds + 1):
+                round_started = time.perf_counter()
                 yield f"data: {json.dumps({'type': 'round_start', 'round': round_num})}\n\n"
-                round_responses = await collect_round_responses(request.content, debaters, previous, round_num)
+                round_task = asyncio.create_task(collect_round_responses(
+                    request.content, debaters, previous, round_num, on_event=events.put_nowait
+                ))
+                async for event in drain_events(round_task, events):
+                    yield f"data: {json.dumps(event)}\n\n"
+                round_responses = round_task.result()
                 rounds.append(round_responses)
-                yield f"data: {json.dumps({'type': 'round_complete', 'round': round_num, 'data': round_responses})}\n\n"
+                durations[f"round_{round_num}"] = time.perf_counter() - round_started
+                round_stats = summarize_stage(round_responses, durations[f"round_{round_num}"])
+                yield f"data: {json.dumps({'type': 'round_complete', 'round': round_num, 'data': round_responses, 'stats': round_stats})}\n\n"
                 previous = round_responses
 
             # Optional moderator verdict
@@ -299,19 +545,28 @@ async def send_message_stream(conversation_id: str, request: SendMessageRequest)
                 yield f"data: {json.dumps({'type': 'verdict_start'})}\n\n"
                 moderator = get_debate_moderator_by_id(moderator_name)
                 if moderator:
-                    verdict = await generate_verdict(request.content, openings, rounds, moderator)
-                    yield f"data: {json.dumps({'type': 'verdict_complete', 'data': verdict})}\n\n"
+                    verdict_started = time.perf_counter()
+                    verdict_task = asyncio.create_task(generate_verdict(
+                        request.content, openings, rounds, moderator, on_event=events.put_nowait
+                    ))
+                    async for event in drain_events(verdict_task, events):
+                        yield f"data: {json.dumps(event)}\n\n"
+                    verdict = verdict_task.result()
+                    durations["verdict"] = time.perf_counter() - verdict_started
+                    yield f"data: {json.dumps({'type': 'verdict_complete', 'data': verdict, 'stats': summarize_stage([verdict], durations['verdict'])})}\n\n"
 
             # Wait for title
             if title_task:
                 title = await title_task
-                storage.update_conversation_title(conversation_id, title)
+                await storage.update_conversation_title(conversation_id, title)
                 yield f"data: {json.dumps({'type': 'title_complete', 'data': {'title': title}})}\n\n"
 
+            stats = debate_stats(openings, rounds, verdict, durations, time.perf_counter() - started)
+
             # Save debate message
-            storage.add_debate_message(conversation_id, openings, rounds, verdict)
+            await storage.add_debate_message(conversation_id, openings, rounds, verdict, stats)
 
-            yield f"data: {json.dumps({'type': 'complete'})}\n\n"
+            yield f"data: {json.dumps({'type': 'complete', 'stats': stats})}\n\n"
 
         except Exception as e:
             yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
@@ -319,7 +574,7 @@ async def send_message_stream(conversation_id: str, request: SendMessageRequest)
     event_generator = debate_event_generator if is_debate else council_event_generator
 
     return StreamingResponse(
-        event_generator(),
+        timed_stream(event_generator(), "debate" if is_debate else "council"),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -0,0 +1,230 @@
+"""
+Prometheus metrics for Cipher, rendered in the text exposition format.
+
+A small in-process registry (counters, gauges, histograms and callback
+metrics sampled at scrape time) so the backend needs no extra dependency.
+All updates happen on the event loop.
+"""
+
+from typing import List, Dict, Any, Callable, Iterable, Tuple
+
+LabelValues = Tuple[str, ...]
+
+# Upstream calls and stages span very different time scales
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+STAGE_BUCKETS = (0.5, 1, 2.5, 5, 10, 20, 30, 60, 90, 120, 180, 300)
+STORAGE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Metric:
+    """Base for a metric family with a fixed set of label names."""
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, help_text: str, labels: Iterable[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(labels)
+
+    def _key(self, labels: Dict[str, Any]) -> LabelValues:
+        return tuple(str(labels.get(name, "")) for name in self.label_names)
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.type_name}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """Monotonically increasing count per label set."""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: Iterable[str] = ()):
+        super().__init__(name, help_text, labels)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"
+            for key, value in sorted(self._values.items())
+        ]
+
+
+class Gauge(Counter):
+    """Value that can go up and down per label set."""
+
+    type_name = "gauge"
+
+    def set(self, value: float, **labels: Any):
+        self._values[self._key(labels)] = value
+
+    def dec(self, amount: float = 1.0, **labels: Any):
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    """Cumulative bucket counts plus sum and count per label set."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labels: Iterable[str] = (),
+        buckets: Iterable[float] = LATENCY_BUCKETS
+    ):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        self._series: Dict[LabelValues, List[float]] = {}  # bucket counts..., sum, count
+
+    def observe(self, value: float, **labels: Any):
+        key = self._key(labels)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = [0.0] * (len(self.buckets) + 2)
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[index] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def samples(self) -> List[str]:
+        lines = []
+        for key, series in sorted(self._series.items()):
+            for bound, count in zip(self.buckets, series):
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names, key, le)} {_format_value(count)}")
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(round(series[-2], 6))}")
+            lines.append(f"{self.name}_count{labels} {_format_value(series[-1])}")
+        return lines
+
+
+class CallbackMetric(Metric):
+    """Gauge or counter whose values are read from a callback at scrape time."""
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        callback: Callable[[], Dict[LabelValues, float]],
+        labels: Iterable[str] = (),
+        type_name: str = "gauge"
+    ):
+        super().__init__(name, help_text, labels)
+        self.callback = callback
+        self.type_name = type_name
+
+    def samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"
+            for key, value in sorted(self.callback().items())
+        ]
+
+
+class Registry:
+    """Ordered collection of metric families."""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+
+registry = Registry()
+
+UPSTREAM_REQUEST_SECONDS = registry.register(Histogram(
+    "cipher_upstream_request_seconds",
+    "Duration of successful upstream model requests (one attempt).",
+    ["model"],
+))
+UPSTREAM_TTFB_SECONDS = registry.register(Histogram(
+    "cipher_upstream_ttfb_seconds",
+    "Time to first byte (non-streaming) or first token (streaming) of upstream requests.",
+    ["model"],
+))
+UPSTREAM_ERRORS = registry.register(Counter(
+    "cipher_upstream_errors_total",
+    "Failed upstream request attempts by status code or exception type.",
+    ["model", "status"],
+))
+PROMPT_TOKENS = registry.register(Counter(
+    "cipher_prompt_tokens_total",
+    "Upstream prompt tokens, split into provider prompt-cache hits and misses.",
+    ["model", "cache"],
+))
+STAGE_DURATION_SECONDS = registry.register(Histogram(
+    "cipher_stage_duration_seconds",
+    "Wall-clock duration of council stages and debate phases.",
+    ["mode", "stage"],
+    STAGE_BUCKETS,
+))
+SSE_STREAM_SECONDS = registry.register(Histogram(
+    "cipher_sse_stream_seconds",
+    "Duration of streamed council and debate responses.",
+    ["mode"],
+    STAGE_BUCKETS,
+))
+SSE_STREAM_ERRORS = registry.register(Counter(
+    "cipher_sse_stream_errors_total",
+    "Streamed responses that ended with an error event.",
+    ["mode"],
+))
+STORAGE_SECONDS = registry.register(Histogram(
+    "cipher_storage_operation_seconds",
+    "Latency of conversation storage operations, including worker-thread handoff.",
+    ["operation"],
+    STORAGE_BUCKETS,
+))
+STORAGE_ERRORS = registry.register(Counter(
+    "cipher_storage_errors_total",
+    "Conversation storage operations that raised.",
+    ["operation"],
+))
+
+
+def observe_stages(mode: str, durations: Dict[str, float]):
+    """
+    Record measured stage durations.
+
+    Args:
+        mode: "council" or "debate"
+        durations: Stage name -> seconds. Debate rounds ("round_1", ...) are
+            recorded under a single "round" stage to bound label cardinality.
+    """
+    for stage, seconds in durations.items():
+        if stage.startswith("round_"):
+            stage = "round"
+        STAGE_DURATION_SECONDS.observe(seconds, mode=mode, stage=stage)
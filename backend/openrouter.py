@@ -1,62 +1,897 @@
 """OpenRouter API client for making LLM requests."""
 
+import asyncio
+import itertools
+import json
+import logging
+import random
+import time
 import httpx
-from typing import List, Dict, Any, Optional
-from .config import OPENROUTER_API_KEY, OPENROUTER_API_URL
+from collections import Counter, defaultdict, deque
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from email.utils import parsedate_to_datetime
+from typing import List, Dict, Any, Optional, AsyncIterator, Awaitable, Callable, Deque, Tuple
+from .config import (
+    OPENROUTER_API_KEY,
+    OPENROUTER_API_URL,
+    HTTP2_ENABLED,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    HTTP_KEEPALIVE_EXPIRY,
+    HTTP_CONNECT_TIMEOUT,
+    HEDGE_AFTER,
+    HEDGE_MIN_SAMPLES,
+    HEDGE_PERCENTILE,
+    RETRY_ATTEMPTS,
+    RETRY_BASE_DELAY,
+    RETRY_MAX_DELAY,
+    RETRY_AFTER_MAX,
+    MODEL_RATE_LIMIT,
+    MODEL_RATE_BURST,
+    MAX_UPSTREAM_CONCURRENCY,
+    MAX_MODEL_CONCURRENCY,
+    PROMPT_CACHE_HINTS,
+    PROMPT_CACHE_HINT_PROVIDERS,
+)
+from . import cache, metrics
+from .telemetry import parse_usage
+
+logger = logging.getLogger(__name__)
+
+# Upstream failures worth another attempt
+RETRY_STATUS_CODES = {408, 409, 425, 429, 500, 502, 503, 504}
+RETRY_EXCEPTIONS = (
+    httpx.ConnectError,
+    httpx.ConnectTimeout,
+    httpx.ReadError,
+    httpx.WriteError,
+    httpx.RemoteProtocolError,
+    httpx.PoolTimeout,
+)
+
+# Process-wide client shared by every upstream call. Managed by the FastAPI
+# lifespan in main.py, but created lazily so scripts can use query_model too.
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _build_client() -> httpx.AsyncClient:
+    """Build a pooled keep-alive client for OpenRouter."""
+    limits = httpx.Limits(
+        max_connections=HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+    )
+    return httpx.AsyncClient(
+        http2=HTTP2_ENABLED,
+        limits=limits,
+        timeout=httpx.Timeout(120.0, connect=HTTP_CONNECT_TIMEOUT),
+    )
+
+
+def get_client() -> httpx.AsyncClient:
+    """Get the shared HTTP client, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _build_client()
+    return _client
+
+
+async def init_client():
+    """Open the shared HTTP client (called on application startup)."""
+    get_client()
+
+
+async def close_client():
+    """Close the shared HTTP client and drop pooled connections."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def _headers() -> Dict[str, str]:
+    """Build the request headers for OpenRouter."""
+    return {
+        "Authorization": f"Bearer {OPENROUTER_API_KEY}",
+        "Content-Type": "application/json",
+    }
+
+
+class OpenRouterError(Exception):
+    """An error response from OpenRouter, with what is needed to decide on a retry."""
+
+    def __init__(self, status_code: int, body: str, retry_after: Optional[float] = None):
+        super().__init__(f"Status {status_code}: {body}")
+        self.status_code = status_code
+        self.body = body
+        self.retry_after = retry_after
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given either in seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def _raise_for_status(response: httpx.Response, body: str):
+    """Raise OpenRouterError for any non-200 response."""
+    if response.status_code != 200:
+        raise OpenRouterError(
+            response.status_code,
+            body,
+            _parse_retry_after(response.headers.get("retry-after"))
+        )
+
+
+class TokenBucket:
+    """
+    Request-rate limiter for one model, shared by every conversation in the process.
+
+    Callers reserve a token synchronously and then sleep off any debt, so waiters
+    are served in arrival order without needing a lock. A 429 blocks the whole
+    bucket until the provider's Retry-After has passed.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    async def acquire(self):
+        """Wait until a request may be sent."""
+        if self.rate <= 0:
+            return
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+
+        wait = max(self.blocked_until - now, -self.tokens / self.rate)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def block_for(self, seconds: float):
+        """Hold back every caller for the given number of seconds."""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+
+_rate_limiters: Dict[str, TokenBucket] = {}
+
+
+def get_rate_limiter(model: str) -> TokenBucket:
+    """Get the shared token bucket for a model."""
+    if model not in _rate_limiters:
+        _rate_limiters[model] = TokenBucket(MODEL_RATE_LIMIT, MODEL_RATE_BURST)
+    return _rate_limiters[model]
+
+
+def _retry_delay(error: Exception, attempt: int) -> Optional[float]:
+    """
+    Decide whether a failed attempt should be retried.
+
+    Returns:
+        Seconds to wait before the next attempt, or None if the error is not transient
+    """
+    if isinstance(error, OpenRouterError):
+        if error.status_code not in RETRY_STATUS_CODES:
+            return None
+        if error.retry_after is not None:
+            return min(error.retry_after, RETRY_AFTER_MAX)
+    elif not isinstance(error, RETRY_EXCEPTIONS):
+        return None
+
+    # Exponential backoff with full jitter
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * (2 ** attempt)))
+
+
+# Priority classes for upstream calls (lower runs first)
+PRIORITY_INTERACTIVE = 0  # the user is waiting on this call alone (stage 3, titles, verdicts)
+PRIORITY_NORMAL = 1  # council members and debate statements
+PRIORITY_BACKGROUND = 2  # batch work nobody is watching
+
+# Conversation the current task is working for, used for fair queueing.
+# Set by the request handlers in main.py and inherited by the tasks they start.
+current_conversation: ContextVar[Optional[str]] = ContextVar("current_conversation", default=None)
+
+
+class UpstreamScheduler:
+    """
+    Admission control for upstream model calls.
+
+    Bounds in-flight requests globally and per model. Waiting calls are served by
+    priority class first, then round-robin across conversations (ordered by how
+    many calls each conversation has already issued), then in arrival order.
+    A call blocked only by its model's limit does not hold back calls to other models.
+    """
+
+    def __init__(self, global_limit: int, per_model_limit: int):
+        self.global_limit = global_limit
+        self.per_model_limit = per_model_limit
+        self._waiting: List[List[Any]] = []  # [sort key, future, model, conversation, enqueued at]
+        self._in_flight = 0
+        self._in_flight_by_model: Counter = Counter()
+        self._issued: Counter = Counter()  # calls issued per active conversation
+        self._active: Counter = Counter()  # queued + in-flight calls per conversation
+        self._seq = itertools.count()
+        self._wait_times: Deque[float] = deque(maxlen=1000)
+        self._granted_total = 0
+
+    @asynccontextmanager
+    async def slot(self, model: str, priority: int = PRIORITY_NORMAL):
+        """
+        Hold an upstream slot for the duration of the block.
+
+        Yields:
+            Seconds spent waiting in the queue
+        """
+        conversation = current_conversation.get()
+        waited = await self._acquire(model, priority, conversation)
+        try:
+            yield waited
+        finally:
+            self._release(model, conversation)
+
+    async def _acquire(self, model: str, priority: int, conversation: Optional[str]) -> float:
+        loop = asyncio.get_running_loop()
+        key = (priority, self._issued[conversation], next(self._seq))
+        self._issued[conversation] += 1
+        self._active[conversation] += 1
+
+        future = loop.create_future()
+        waiter = [key, future, model, conversation, loop.time()]
+        self._waiting.append(waiter)
+        self._dispatch()
+
+        try:
+            return await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just as we were cancelled: hand the slot back
+                self._release(model, conversation)
+            else:
+                if waiter in self._waiting:
+                    self._waiting.remove(waiter)
+                self._forget(conversation)
+            raise
+
+    def _dispatch(self):
+        """Grant slots to waiting calls in priority/fairness order while capacity lasts."""
+        if not self._waiting:
+            return
+        loop = asyncio.get_running_loop()
+        self._waiting.sort(key=lambda waiter: waiter[0])
+
+        still_waiting = []
+        for waiter in self._waiting:
+            _, future, model, _, enqueued_at = waiter
+            if future.done():
+                continue
+            if self._in_flight >= self.global_limit or self._in_flight_by_model[model] >= self.per_model_limit:
+                still_waiting.append(waiter)
+                continue
+
+            self._in_flight += 1
+            self._in_flight_by_model[model] += 1
+            waited = loop.time() - enqueued_at
+            self._wait_times.append(waited)
+            self._granted_total += 1
+            future.set_result(waited)
+
+        self._waiting = still_waiting
+
+    def _release(self, model: str, conversation: Optional[str]):
+        self._in_flight -= 1
+        self._in_flight_by_model[model] -= 1
+        if self._in_flight_by_model[model] <= 0:
+            del self._in_flight_by_model[model]
+        self._forget(conversation)
+        self._dispatch()
+
+    def _forget(self, conversation: Optional[str]):
+        """Drop a conversation's fairness state once it has nothing queued or running."""
+        self._active[conversation] -= 1
+        if self._active[conversation] <= 0:
+            del self._active[conversation]
+            self._issued.pop(conversation, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot of queue depth, in-flight calls and recent queue wait times."""
+        waits = sorted(self._wait_times)
+
+        def percentile(fraction: float) -> float:
+            if not waits:
+                return 0.0
+            return round(waits[min(len(waits) - 1, int(len(waits) * fraction))], 4)
+
+        depth_by_priority = Counter(waiter[0][0] for waiter in self._waiting)
+        return {
+            "global_limit": self.global_limit,
+            "per_model_limit": self.per_model_limit,
+            "in_flight": self._in_flight,
+            "in_flight_by_model": dict(self._in_flight_by_model),
+            "queue_depth": len(self._waiting),
+            "queue_depth_by_priority": {
+                "interactive": depth_by_priority[PRIORITY_INTERACTIVE],
+                "normal": depth_by_priority[PRIORITY_NORMAL],
+                "background": depth_by_priority[PRIORITY_BACKGROUND],
+            },
+            "active_conversations": len(self._active),
+            "granted_total": self._granted_total,
+            "wait_seconds": {
+                "mean": round(sum(waits) / len(waits), 4) if waits else 0.0,
+                "p50": percentile(0.5),
+                "p95": percentile(0.95),
+                "max": round(waits[-1], 4) if waits else 0.0,
+            },
+        }
+
+
+scheduler = UpstreamScheduler(MAX_UPSTREAM_CONCURRENCY, MAX_MODEL_CONCURRENCY)
+
+
+def cacheable_content(text: str, model: str) -> Any:
+    """
+    Message content for a prompt prefix that is shared across requests.
+
+    Providers that only cache at explicit breakpoints get the text as a content
+    part marked with cache_control; everyone else gets the plain string and
+    caches the prefix automatically.
+
+    Args:
+        text: The shared text, which must come before anything request-specific
+        model: OpenRouter model identifier the message is built for
+
+    Returns:
+        A string, or a list with one cache_control text part
+    """
+    if PROMPT_CACHE_HINTS and model.startswith(PROMPT_CACHE_HINT_PROVIDERS):
+        return [{"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}]
+    return text
+
+
+async def stream_model(
+    model: str,
+    messages: List[Dict[str, str]],
+    timeout: float = 120.0,
+    params: Optional[Dict[str, Any]] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Stream a completion from a single model using OpenRouter's SSE mode.
+
+    This is a single attempt: retries and rate limiting are applied by query_model.
+
+    Args:
+        model: OpenRouter model identifier (e.g., "openai/gpt-4o")
+        messages: List of message dicts with 'role' and 'content'
+        timeout: Request timeout in seconds (applies per read, not to the whole stream)
+        params: Optional extra request parameters (sampling settings etc.)
+
+    Yields:
+        Delta dicts as sent by OpenRouter (e.g. {'content': '...'}), then
+        {'usage': {...}} with the token counts and cost of the call.
+
+    Raises:
+        OpenRouterError or httpx.HTTPError if the request or the stream fails
+    """
+    payload = {
+        "model": model,
+        "messages": messages,
+        "usage": {"include": True},
+        **(params or {}),
+        "stream": True,
+    }
+
+    client = get_client()
+    async with client.stream(
+        "POST",
+        OPENROUTER_API_URL,
+        headers=_headers(),
+        json=payload,
+        timeout=httpx.Timeout(timeout, connect=HTTP_CONNECT_TIMEOUT)
+    ) as response:
+        if response.status_code != 200:
+            _raise_for_status(response, (await response.aread()).decode(errors="replace"))
+
+        async for line in response.aiter_lines():
+            # Skip blank separators and keep-alive comments (": OPENROUTER PROCESSING")
+            if not line.startswith("data:"):
+                continue
+            data = line[5:].strip()
+            if data == "[DONE]":
+                break
+
+            chunk = json.loads(data)
+            if "error" in chunk:
+                error = chunk["error"]
+                code = error.get("code") if isinstance(error, dict) else None
+                raise OpenRouterError(code if isinstance(code, int) else 500, json.dumps(error))
+
+            choices = chunk.get("choices") or []
+            if choices:
+                yield choices[0].get("delta") or {}
+            if chunk.get("usage"):
+                # Sent with the final chunk
+                yield {"usage": chunk["usage"]}
+
+
+class _Flight:
+    """One upstream call shared by every concurrent caller with the same key."""
+
+    def __init__(self, streaming: bool):
+        self.streaming = streaming
+        self.chunks: List[str] = []
+        self.listeners: List[Callable[[str], None]] = []
+        self.waiters = 0
+        self.task: Optional["asyncio.Task"] = None
+
+    def broadcast(self, chunk: str):
+        self.chunks.append(chunk)
+        for listener in list(self.listeners):
+            listener(chunk)
+
+
+class SingleFlight:
+    """
+    Coalesces identical in-flight model calls into one upstream request.
+
+    The first caller starts the request; later callers with the same key await
+    the same result. Streaming callers that join late get the chunks produced so
+    far replayed, then follow the live stream. If the shared call is not
+    streaming, a streaming follower receives the whole answer as one chunk. The
+    upstream request is cancelled only when every caller has gone away.
+    """
+
+    def __init__(self):
+        self._flights: Dict[str, _Flight] = {}
+        self.coalesced_total = 0
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._flights)
+
+    async def run(
+        self,
+        key: str,
+        call: Callable[[Optional[Callable[[str], None]]], Awaitable[Optional[Dict[str, Any]]]],
+        on_delta: Optional[Callable[[str], None]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Run call(on_delta) once per key across concurrent callers.
+
+        Args:
+            key: Identity of the request (see cache.cache_key)
+            call: Starts the upstream request, given the chunk callback to stream into
+            on_delta: This caller's chunk callback, if it wants a stream
+        """
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(streaming=on_delta is not None)
+            flight.task = asyncio.create_task(call(flight.broadcast if flight.streaming else None))
+            self._flights[key] = flight
+
+            def forget(_task, flight=flight):
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+
+            flight.task.add_done_callback(forget)
+        else:
+            self.coalesced_total += 1
+
+        listening = on_delta is not None and flight.streaming
+        if listening:
+            for chunk in flight.chunks:
+                on_delta(chunk)
+            flight.listeners.append(on_delta)
+
+        flight.waiters += 1
+        try:
+            result = await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if listening:
+                flight.listeners.remove(on_delta)
+            if flight.waiters == 0 and not flight.task.done():
+                # Nobody is left: abandon the call so new callers start afresh
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+                flight.task.cancel()
+
+        if on_delta is not None and not flight.streaming and result and result.get('content'):
+            on_delta(result['content'])
+        return result
+
+
+single_flight = SingleFlight()
 
 
 async def query_model(
     model: str,
     messages: List[Dict[str, str]],
-    timeout: float = 120.0
+    timeout: float = 120.0,
+    on_delta: Optional[Callable[[str], None]] = None,
+    priority: int = PRIORITY_NORMAL,
+    params: Optional[Dict[str, Any]] = None,
+    coalesce: bool = True
 ) -> Optional[Dict[str, Any]]:
     """
     Query a single model via OpenRouter API.
 
+    Identical requests (same model, messages and params) are answered from the
+    response cache unless the current request opted out, and identical calls
+    already in flight are joined rather than sent again. Otherwise each attempt
+    waits for a scheduler slot and then the model's shared rate limiter.
+    Transient failures (429, 5xx, connection errors) are retried with jittered
+    exponential backoff, honouring Retry-After. A streamed call is only retried
+    if no chunk has been forwarded yet.
+
     Args:
         model: OpenRouter model identifier (e.g., "openai/gpt-4o")
         messages: List of message dicts with 'role' and 'content'
         timeout: Request timeout in seconds
+        on_delta: Optional callback receiving each content chunk. When given,
+            the completion is streamed and the callback fires as tokens arrive.
+        priority: Scheduler priority class (PRIORITY_INTERACTIVE, _NORMAL or _BACKGROUND)
+        params: Optional extra request parameters (sampling settings etc.), part of the cache key
+        coalesce: Join an identical in-flight call instead of sending a new one.
+            Disabled for hedged duplicates, which must reach the provider.
 
     Returns:
-        Response dict with 'content' and optional 'reasoning_details', or None if failed
+        Response dict with 'content', optional 'reasoning_details', 'usage'
+        (tokens and cost, see telemetry.parse_usage) and 'timing' (seconds of
+        queue wait, time to first byte/token and total, plus attempts), or None
+        if failed
     """
-    headers = {
-        "Authorization": f"Bearer {OPENROUTER_API_KEY}",
-        "Content-Type": "application/json",
-    }
+    key = cache.cache_key(model, messages, params)
+    use_cache = cache.is_enabled()
+    if use_cache:
+        cached = await cache.response_cache.get(key)
+        if cached is not None:
+            if on_delta is not None and cached.get('content'):
+                on_delta(cached['content'])
+            return {
+                **cached,
+                'cached': True,
+                'timing': {'queue_wait': 0.0, 'ttfb': 0.0, 'total': 0.0, 'attempts': 0}
+            }
+
+    def call(forward: Optional[Callable[[str], None]]):
+        return _query_with_retries(model, messages, timeout, forward, priority, params)
+
+    if coalesce:
+        result = await single_flight.run(key, call, on_delta)
+    else:
+        result = await call(on_delta)
+
+    if use_cache and result is not None:
+        await cache.response_cache.set(key, result)
+    return result
+
+
+async def _query_with_retries(
+    model: str,
+    messages: List[Dict[str, str]],
+    timeout: float,
+    on_delta: Optional[Callable[[str], None]],
+    priority: int,
+    params: Optional[Dict[str, Any]]
+) -> Optional[Dict[str, Any]]:
+    """Run query attempts under the scheduler and rate limiter, retrying transient failures."""
+    limiter = get_rate_limiter(model)
+    streamed = []
+    started = time.perf_counter()
+    queue_wait = 0.0
+
+    def forward(chunk: str):
+        streamed.append(chunk)
+        on_delta(chunk)
+
+    for attempt in range(RETRY_ATTEMPTS + 1):
+        try:
+            async with scheduler.slot(model, priority) as waited:
+                acquire_started = time.perf_counter()
+                await limiter.acquire()
+                sent_at = time.perf_counter()
+                queue_wait += waited + sent_at - acquire_started
+                if on_delta is not None:
+                    result = await _stream_once(model, messages, timeout, forward, params)
+                else:
+                    result = await _post_once(model, messages, timeout, params)
 
+            finished = time.perf_counter()
+            ttfb = result.pop('first_byte_at') - sent_at
+            metrics.UPSTREAM_REQUEST_SECONDS.observe(finished - sent_at, model=model)
+            metrics.UPSTREAM_TTFB_SECONDS.observe(ttfb, model=model)
+            usage = result.get('usage')
+            if usage:
+                cached_tokens = usage['cached_tokens']
+                metrics.PROMPT_TOKENS.inc(cached_tokens, model=model, cache="hit")
+                metrics.PROMPT_TOKENS.inc(usage['prompt_tokens'] - cached_tokens, model=model, cache="miss")
+            result['timing'] = {
+                'queue_wait': round(queue_wait, 4),
+                'ttfb': round(ttfb, 4),
+                'total': round(finished - started, 4),
+                'attempts': attempt + 1
+            }
+            return result
+
+        except Exception as e:
+            status = e.status_code if isinstance(e, OpenRouterError) else type(e).__name__
+            metrics.UPSTREAM_ERRORS.inc(model=model, status=status)
+            delay = None if streamed else _retry_delay(e, attempt)
+            if delay is None or attempt == RETRY_ATTEMPTS:
+                logger.error("Querying model %s failed: %s: %s", model, type(e).__name__, e)
+                return None
+
+            if isinstance(e, OpenRouterError) and e.status_code == 429:
+                limiter.block_for(delay)
+            logger.warning(
+                "Querying model %s failed (%s), retry %d/%d in %.1fs",
+                model, e, attempt + 1, RETRY_ATTEMPTS, delay
+            )
+            await asyncio.sleep(delay)
+
+    return None
+
+
+async def _post_once(
+    model: str,
+    messages: List[Dict[str, str]],
+    timeout: float,
+    params: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Send one non-streaming completion request ('first_byte_at' marks the response headers)."""
     payload = {
         "model": model,
         "messages": messages,
+        "usage": {"include": True},
+        **(params or {}),
+    }
+
+    client = get_client()
+    request = client.build_request(
+        "POST",
+        OPENROUTER_API_URL,
+        headers=_headers(),
+        json=payload,
+        timeout=httpx.Timeout(timeout, connect=HTTP_CONNECT_TIMEOUT)
+    )
+    response = await client.send(request, stream=True)
+    first_byte_at = time.perf_counter()
+    try:
+        await response.aread()
+    finally:
+        await response.aclose()
+    _raise_for_status(response, response.text)
+
+    data = response.json()
+    message = data['choices'][0]['message']
+
+    return {
+        'content': message.get('content'),
+        'reasoning_details': message.get('reasoning_details'),
+        'usage': parse_usage(data.get('usage')),
+        'first_byte_at': first_byte_at
+    }
+
+
+async def _stream_once(
+    model: str,
+    messages: List[Dict[str, str]],
+    timeout: float,
+    on_delta: Callable[[str], None],
+    params: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Stream one completion, forwarding chunks to on_delta, and return the full result.
+
+    The returned 'first_byte_at' (perf_counter time of the first content token)
+    is consumed by _query_with_retries for the TTFB measurement.
+    """
+    content_parts = []
+    reasoning_details = []
+    usage = None
+    first_byte_at = None
+
+    async for delta in stream_model(model, messages, timeout, params):
+        chunk = delta.get('content')
+        if chunk:
+            if first_byte_at is None:
+                first_byte_at = time.perf_counter()
+            content_parts.append(chunk)
+            on_delta(chunk)
+        if delta.get('reasoning_details'):
+            reasoning_details.extend(delta['reasoning_details'])
+        if delta.get('usage'):
+            usage = delta['usage']
+
+    return {
+        'content': ''.join(content_parts),
+        'reasoning_details': reasoning_details or None,
+        'usage': parse_usage(usage),
+        'first_byte_at': first_byte_at if first_byte_at is not None else time.perf_counter()
     }
 
+
+# Recent successful latencies per (model, streaming) used to pick hedge delays.
+# For streamed calls this is time to first token, otherwise time to completion.
+_latencies: Dict[Tuple[str, bool], Deque[float]] = defaultdict(lambda: deque(maxlen=200))
+
+
+def record_latency(model: str, streaming: bool, seconds: float):
+    """Record a successful call's latency for hedge-delay estimation."""
+    _latencies[(model, streaming)].append(seconds)
+
+
+def hedge_delay(model: str, streaming: bool) -> float:
+    """
+    Get how long to wait on a model before firing a hedged request.
+
+    Uses the configured percentile of recent latencies once enough samples
+    exist, and HEDGE_AFTER until then.
+    """
+    samples = _latencies.get((model, streaming))
+    if not samples or len(samples) < HEDGE_MIN_SAMPLES:
+        return HEDGE_AFTER
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(len(ordered) * HEDGE_PERCENTILE))
+    return ordered[index]
+
+
+async def query_model_chain(
+    models: List[str],
+    messages: List[Dict[str, str]],
+    timeout: float = 120.0,
+    on_delta: Optional[Callable[[str, bool], None]] = None,
+    deadline: Optional[float] = None,
+    priority: int = PRIORITY_NORMAL,
+    params: Optional[Dict[str, Any]] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Query a fallback chain of models with hedging and an overall deadline.
+
+    The first model is queried immediately. If it fails, the next model in the
+    chain is tried. If it is slow (no first token when streaming, no answer
+    otherwise, within hedge_delay), a hedged request goes to the next model in
+    the chain, or a duplicate to the same model when there is no fallback. The
+    first successful answer wins and the other attempts are cancelled.
+
+    When streaming, only the first attempt to produce a token forwards chunks to
+    on_delta. If that attempt fails mid-stream, the next attempt to produce
+    output takes over and replays what it buffered, its first chunk passed as
+    on_delta(chunk, True) so the client discards the failed attempt's text.
+    If the deadline passes before any attempt finishes, the longest partial
+    streamed answer is returned with 'truncated': True.
+
+    Args:
+        models: Model identifiers in preference order
+        messages: List of message dicts with 'role' and 'content'
+        timeout: Per-request timeout in seconds
+        on_delta: Optional callback receiving content chunks (enables streaming).
+            Called as on_delta(chunk, restart), where restart is True for the
+            first chunk of an attempt that replaces already-streamed text.
+        deadline: Optional overall time budget in seconds
+        priority: Scheduler priority class for every attempt
+        params: Optional extra request parameters for every attempt
+
+    Returns:
+        Response dict as from query_model plus the 'model' that answered, or
+        None if every attempt failed
+    """
+    loop = asyncio.get_running_loop()
+    deadline_at = loop.time() + deadline if deadline is not None else None
+    streaming = on_delta is not None
+
+    queue = list(models)
+    attempts: Dict["asyncio.Task", Dict[str, Any]] = {}
+    committed: List[Dict[str, Any]] = []  # attempt currently allowed to stream
+    first_token = asyncio.Event()
+    forwarded = []  # set once any chunk has reached on_delta
+    hedged_duplicate = False
+
+    def launch(model: str, duplicate: bool = False) -> str:
+        attempt = {"model": model, "parts": [], "started": loop.time()}
+
+        def forward(chunk: str):
+            if not attempt["parts"]:
+                record_latency(model, True, loop.time() - attempt["started"])
+            attempt["parts"].append(chunk)
+            if not committed:
+                # First attempt to produce output takes over the stream,
+                # replaying anything it buffered while another attempt held it.
+                # If a failed attempt already streamed text, the client restarts.
+                committed.append(attempt)
+                first_token.set()
+                for index, part in enumerate(attempt["parts"]):
+                    on_delta(part, index == 0 and bool(forwarded))
+                forwarded.append(True)
+            elif committed[0] is attempt:
+                on_delta(chunk, False)
+
+        task = asyncio.create_task(
+            query_model(
+                model, messages, timeout,
+                on_delta=forward if streaming else None,
+                priority=priority,
+                coalesce=not duplicate,
+                params=params
+            )
+        )
+        attempts[task] = attempt
+        return model
+
+    running = launch(queue.pop(0))
+    hedge_at = loop.time() + hedge_delay(running, streaming)
+
     try:
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            response = await client.post(
-                OPENROUTER_API_URL,
-                headers=headers,
-                json=payload
+        while attempts:
+            waits = [] if deadline_at is None else [deadline_at - loop.time()]
+            can_hedge = not first_token.is_set() and (queue or not hedged_duplicate)
+            if can_hedge:
+                waits.append(hedge_at - loop.time())
+            wait_timeout = max(0.0, min(waits)) if waits else None
+
+            done, _ = await asyncio.wait(
+                set(attempts), timeout=wait_timeout, return_when=asyncio.FIRST_COMPLETED
             )
-            
-            if response.status_code != 200:
-                error_body = response.text
-                print(f"Error querying model {model}: Status {response.status_code}")
-                print(f"Response: {error_body}")
-                return None
-            
-            data = response.json()
-            message = data['choices'][0]['message']
 
-            return {
-                'content': message.get('content'),
-                'reasoning_details': message.get('reasoning_details')
-            }
+            for task in done:
+                attempt = attempts.pop(task)
+                result = task.result()
+                if result is not None:
+                    if not streaming:
+                        record_latency(attempt["model"], False, loop.time() - attempt["started"])
+                    return {**result, "model": attempt["model"]}
+                if committed and committed[0] is attempt:
+                    committed.clear()
+                    first_token.clear()
+
+            if deadline_at is not None and loop.time() >= deadline_at:
+                partial = max(attempts.values(), key=lambda a: len(a["parts"]), default=None)
+                if partial is None or not partial["parts"]:
+                    logger.warning("Deadline reached querying %s with no answer", models[0])
+                    return None
+                logger.warning(
+                    "Deadline reached querying %s, using partial answer from %s",
+                    models[0], partial["model"]
+                )
+                return {
+                    "content": "".join(partial["parts"]),
+                    "reasoning_details": None,
+                    "model": partial["model"],
+                    "truncated": True
+                }
+
+            if not attempts and queue:
+                # Everything in flight failed: fall back to the next model
+                running = launch(queue.pop(0))
+                hedge_at = loop.time() + hedge_delay(running, streaming)
+            elif not done and can_hedge and loop.time() >= hedge_at:
+                # Primary is slow: hedge to the next model, or duplicate the request
+                if queue:
+                    running = launch(queue.pop(0))
+                else:
+                    hedged_duplicate = True
+                    running = launch(models[-1], duplicate=True)
+                hedge_at = loop.time() + hedge_delay(running, streaming)
 
-    except Exception as e:
-        print(f"Exception querying model {model}: {type(e).__name__}: {e}")
         return None
 
+    finally:
+        for task in attempts:
+            task.cancel()
+
 
 async def query_models_parallel(
     models: List[str],
@@ -72,8 +907,6 @@ async def query_models_parallel(
     Returns:
         Dict mapping model identifier to response dict (or None if failed)
     """
-    import asyncio
-
     # Create tasks for all models
     tasks = [query_model(model, messages) for model in models]
 
@@ -540,6 +540,21 @@ DEFAULT_COUNCIL = [
 
 DEFAULT_CHAIRMAN = CHAIRMAN_OPTIONS[0]  # Strategic Principal
 
+# Fallback chains: models tried (or hedged to) when a persona's primary model is
+# slow or failing. A persona can override this with its own "fallback_models" list.
+MODEL_FALLBACKS = {
+    "x-ai/grok-3": ["openai/gpt-4.1", "anthropic/claude-sonnet-4"],
+    "anthropic/claude-sonnet-4": ["openai/gpt-4.1"],
+    "openai/gpt-4.1": ["anthropic/claude-sonnet-4"],
+    "google/gemini-2.5-pro": ["openai/gpt-4.1"],
+}
+
+
+def get_model_chain(persona):
+    """Get the models to try for a persona: its own model first, then fallbacks."""
+    fallbacks = persona.get("fallback_models", MODEL_FALLBACKS.get(persona["model"], []))
+    return [persona["model"]] + [model for model in fallbacks if model != persona["model"]]
+
 
 def get_personas_by_category():
     """Get all personas organized by category."""
@@ -0,0 +1,284 @@
+"""Extraction of rankings from stage 2 reviews: FINAL RANKING text or JSON."""
+
+import re
+from functools import lru_cache
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+from pydantic import BaseModel, Field, ValidationError
+
+LABEL_PREFIX = "Response from "
+HEADING = "FINAL RANKING"
+
+# Reviews end with the ranking, so the heading is found by searching backwards
+# from the end; the spelled-out pattern is only needed when a model changed its case.
+_HEADING = re.compile(r"FINAL\s+RANKING", re.IGNORECASE)
+# The section is short, so labels there are matched case-insensitively. Whole
+# reviews are scanned with a literal prefix, which the regex engine skips to quickly.
+_SECTION_LABEL = re.compile(r"Response\s+from\s+([a-z][a-z0-9 &-]*)", re.IGNORECASE)
+_TEXT_LABEL = re.compile(r"Response\s+from\s+([A-Za-z][A-Za-z0-9 &-]*)")
+# What may precede a numbered label on its line: "1. ", "- 2) ", "**3.** "
+_NUMBER_PREFIX = re.compile(r"[ \t>*_-]*\d+\s*[.):]\s*[*_]*\s*$")
+
+
+def canonical_label(name: str) -> str:
+    """
+    The label a council member's response goes by in stage 2.
+
+    Args:
+        name: Member name, or a label as written by a reviewer
+
+    Returns:
+        "Response from <lowercased name>" with whitespace collapsed
+    """
+    name = " ".join(name.split()).lower()
+    if name.startswith(LABEL_PREFIX.lower()):
+        name = name[len(LABEL_PREFIX):]
+    return LABEL_PREFIX + name.strip(" -&")
+
+
+@lru_cache(maxsize=4096)
+def _resolve(mention: str, known: Optional[Tuple[str, ...]]) -> str:
+    """Map a label mention to a known label: the longest one it starts with."""
+    label = canonical_label(mention)
+    if known is None or label in known:
+        return label
+    for candidate in known:
+        if label.startswith(candidate + " "):
+            return candidate
+    if label.startswith(LABEL_PREFIX + "the "):
+        return _resolve(LABEL_PREFIX + label[len(LABEL_PREFIX) + 4:], known)
+    return label
+
+
+def _known_labels(labels: Optional[Iterable[str]]) -> Optional[Tuple[str, ...]]:
+    """Labels under review, longest first so prefix matching prefers the most specific."""
+    if labels is None:
+        return None
+    return tuple(sorted(set(labels), key=lambda label: (-len(label), label)))
+
+
+def _find_section(text: str) -> int:
+    """Offset just past the last FINAL RANKING heading, or -1 if there is none."""
+    start = text.rfind(HEADING)
+    if start >= 0:
+        return start + len(HEADING)
+    end = -1
+    for match in _HEADING.finditer(text):
+        end = match.end()
+    return end
+
+
+def parse_ranking(text: str, labels: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """
+    Parse a reviewer's ranking, reading each part of the text at most once.
+
+    The section after the last "FINAL RANKING" heading is authoritative;
+    numbered entries there win over bare mentions. Without a heading every
+    label mentioned in the text counts, in order of appearance.
+
+    Args:
+        text: The reviewer's full response
+        labels: Canonical labels under review. When given, mentions are matched
+            to them (so "Response from security architect offers..." resolves to
+            "Response from security architect") and anything else is reported.
+
+    Returns:
+        Dict with:
+            'ranking': canonical labels, best first, each at most once
+            'positions': label -> 1-based position
+            'duplicates': labels the reviewer ranked more than once (first place kept)
+            'unknown': ranked labels that are not under review (dropped)
+            'missing': labels under review that the reviewer did not rank
+    """
+    known = _known_labels(labels)
+
+    section = _find_section(text)
+    if section >= 0:
+        matches = _SECTION_LABEL.finditer(text, section)
+    else:
+        matches = _TEXT_LABEL.finditer(text)
+
+    mentions, numbered = [], []
+    for match in matches:
+        label = _resolve(LABEL_PREFIX + match.group(1), known)
+        mentions.append(label)
+        line_start = text.rfind("\n", 0, match.start()) + 1
+        if _NUMBER_PREFIX.match(text, line_start, match.start()):
+            numbered.append(label)
+
+    ranking, duplicates, unknown = [], [], []
+    for label in numbered or mentions:
+        if known is not None and label not in known:
+            if label not in unknown:
+                unknown.append(label)
+        elif label in ranking:
+            if label not in duplicates:
+                duplicates.append(label)
+        else:
+            ranking.append(label)
+
+    return {
+        "ranking": ranking,
+        "positions": {label: position for position, label in enumerate(ranking, start=1)},
+        "duplicates": duplicates,
+        "unknown": unknown,
+        "missing": sorted(set(known) - set(ranking)) if known is not None else [],
+    }
+
+
+def ranking_positions(result: Dict[str, Any], labels: Iterable[str]) -> Dict[str, int]:
+    """
+    Positions from a stage 2 result, reusing its parsed ranking when present.
+
+    Args:
+        result: Stage 2 result with 'parsed_ranking' and/or 'ranking' text
+        labels: Canonical labels under review
+
+    Returns:
+        Dict of label -> 1-based position for the labels this reviewer ranked
+    """
+    known = _known_labels(labels)
+    parsed = result.get("parsed_ranking")
+    if parsed is None:
+        return parse_ranking(result.get("ranking", ""), known)["positions"]
+
+    # Stored rankings from older versions may use the reviewer's wording
+    positions = {}
+    for label in parsed:
+        label = _resolve(label, known)
+        if label in known and label not in positions:
+            positions[label] = len(positions) + 1
+    return positions
+
+
+class ResponseReview(BaseModel):
+    """One reviewer's verdict on one response in a JSON review."""
+    label: str
+    score: float = Field(ge=0, le=10)
+    comment: str = ""
+
+
+class PeerReview(BaseModel):
+    """A complete JSON review: per-response scores and an ordering."""
+    reviews: List[ResponseReview]
+    ranking: List[str] = []
+
+
+def review_response_format(labels: List[str]) -> Dict[str, Any]:
+    """
+    The response_format request parameter for JSON reviews.
+
+    The schema sticks to what strict structured-output providers accept (no
+    numeric bounds); the bounds are enforced by PeerReview instead. Providers
+    without structured output ignore the parameter and get the prompt alone.
+
+    Args:
+        labels: Labels under review, offered as an enum
+
+    Returns:
+        Dict for the 'response_format' request field
+    """
+    label = {"type": "string", "enum": list(labels)}
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "peer_review",
+            "strict": True,
+            "schema": {
+                "type": "object",
+                "properties": {
+                    "reviews": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "label": label,
+                                "score": {"type": "number"},
+                                "comment": {"type": "string"}
+                            },
+                            "required": ["label", "score", "comment"],
+                            "additionalProperties": False
+                        }
+                    },
+                    "ranking": {"type": "array", "items": label}
+                },
+                "required": ["reviews", "ranking"],
+                "additionalProperties": False
+            }
+        }
+    }
+
+
+def parse_json_review(text: str, labels: Iterable[str]) -> Optional[Dict[str, Any]]:
+    """
+    Parse a JSON review.
+
+    Responses ranked explicitly come first, in the reviewer's order; scored
+    responses the ranking left out follow by score (then label), so a review
+    with scores alone still yields a full ordering.
+
+    Args:
+        text: The reviewer's response, possibly wrapped in a code fence
+        labels: Canonical labels under review
+
+    Returns:
+        Dict like parse_ranking's plus 'scores' (label -> score) and 'comments'
+        (label -> comment), or None if the text is not a valid review
+    """
+    start, end = text.find("{"), text.rfind("}")
+    if start < 0 or end < start:
+        return None
+    try:
+        review = PeerReview.model_validate_json(text[start:end + 1])
+    except ValidationError:
+        return None
+
+    known = _known_labels(labels)
+    scores, comments, unknown = {}, {}, []
+    for item in review.reviews:
+        label = _resolve(item.label, known)
+        if label not in known:
+            if label not in unknown:
+                unknown.append(label)
+        elif label not in scores:
+            scores[label] = item.score
+            comments[label] = item.comment.strip()
+
+    ranking, duplicates = [], []
+    for label in (_resolve(label, known) for label in review.ranking):
+        if label not in known:
+            if label not in unknown:
+                unknown.append(label)
+        elif label in ranking:
+            if label not in duplicates:
+                duplicates.append(label)
+        else:
+            ranking.append(label)
+    ranking += sorted(
+        (label for label in scores if label not in ranking),
+        key=lambda label: (-scores[label], label)
+    )
+    if not ranking:
+        return None
+
+    return {
+        "ranking": ranking,
+        "positions": {label: position for position, label in enumerate(ranking, start=1)},
+        "duplicates": duplicates,
+        "unknown": unknown,
+        "missing": sorted(set(known) - set(ranking)),
+        "scores": scores,
+        "comments": comments,
+    }
+
+
+def render_json_review(parsed: Dict[str, Any]) -> str:
+    """Readable text for a parsed JSON review, in the FINAL RANKING format."""
+    lines = []
+    for label in parsed["ranking"]:
+        if label in parsed["scores"]:
+            comment = parsed["comments"].get(label)
+            lines.append(f"**{label}**: {parsed['scores'][label]:g}/10" + (f". {comment}" if comment else ""))
+    lines.append("")
+    lines.append(f"{HEADING}:")
+    lines.extend(f"{position}. {label}" for position, label in enumerate(parsed["ranking"], start=1))
+    return "\n".join(lines)
@@ -0,0 +1,238 @@
+"""
+Conversation storage.
+
+The module-level functions are coroutines that run the backend selected by
+STORAGE_BACKEND in config ("sqlite", "jsonl" or "json") in a worker thread, so disk
+I/O never blocks the event loop. Writes to one conversation are serialized
+by a per-conversation lock.
+"""
+
+import asyncio
+import os
+import threading
+import time
+import weakref
+from typing import List, Dict, Any, Optional
+from .. import metrics
+from ..config import DATA_DIR, STORAGE_BACKEND, STORAGE_SQLITE_PATH, JOURNAL_COMPACT_AFTER
+from .base import StorageBackend
+from .json_files import JSONFileStorage
+from .journal import JournalStorage
+from .sqlite import SQLiteStorage
+
+_backend: Optional[StorageBackend] = None
+_backend_lock = threading.Lock()
+
+# Per-conversation write locks; entries disappear once no writer holds them
+_write_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+
+def _import_legacy_files(backend: SQLiteStorage):
+    """Copy conversations saved by the JSON backend into a fresh database."""
+    legacy = JSONFileStorage(DATA_DIR)
+    backend.import_conversations(
+        legacy.get_conversation(meta["id"]) for meta in legacy.list_conversations()
+    )
+
+
+def create_backend(name: str = STORAGE_BACKEND) -> StorageBackend:
+    """
+    Build a storage backend by name.
+
+    Args:
+        name: "sqlite", "jsonl" or "json"
+
+    Returns:
+        The storage backend
+    """
+    if name == "json":
+        return JSONFileStorage(DATA_DIR)
+    if name == "jsonl":
+        return JournalStorage(DATA_DIR, JOURNAL_COMPACT_AFTER)
+    if name == "sqlite":
+        fresh = not os.path.exists(STORAGE_SQLITE_PATH)
+        backend = SQLiteStorage(STORAGE_SQLITE_PATH)
+        if fresh and os.path.isdir(DATA_DIR):
+            _import_legacy_files(backend)
+        return backend
+    raise ValueError(f"Unknown storage backend: {name}")
+
+
+def get_backend() -> StorageBackend:
+    """Get the process-wide storage backend, creating it on first use."""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = create_backend()
+    return _backend
+
+
+def set_backend(backend: StorageBackend):
+    """Replace the process-wide storage backend (e.g. for benchmarks)."""
+    global _backend
+    _backend = backend
+
+
+def _write_lock(conversation_id: str) -> asyncio.Lock:
+    lock = _write_locks.get(conversation_id)
+    if lock is None:
+        lock = asyncio.Lock()
+        _write_locks[conversation_id] = lock
+    return lock
+
+
+async def _call(method: str, *args):
+    started = time.perf_counter()
+    try:
+        backend = _backend or await asyncio.to_thread(get_backend)
+        return await asyncio.to_thread(getattr(backend, method), *args)
+    except Exception:
+        metrics.STORAGE_ERRORS.inc(operation=method)
+        raise
+    finally:
+        metrics.STORAGE_SECONDS.observe(time.perf_counter() - started, operation=method)
+
+
+async def _write(conversation_id: str, method: str, *args):
+    async with _write_lock(conversation_id):
+        return await _call(method, *args)
+
+
+async def create_conversation(conversation_id: str) -> Dict[str, Any]:
+    """
+    Create a new conversation.
+
+    Args:
+        conversation_id: Unique identifier for the conversation
+
+    Returns:
+        New conversation dict
+    """
+    return await _write(conversation_id, "create_conversation", conversation_id)
+
+
+async def get_conversation(conversation_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Load a conversation from storage.
+
+    Args:
+        conversation_id: Unique identifier for the conversation
+
+    Returns:
+        Conversation dict or None if not found
+    """
+    return await _call("get_conversation", conversation_id)
+
+
+async def get_messages(
+    conversation_id: str,
+    after: Optional[int] = None,
+    before: Optional[int] = None,
+    last: Optional[int] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Load a conversation with only a range of its messages.
+
+    Args:
+        conversation_id: Unique identifier for the conversation
+        after: Only messages with an index greater than this
+        before: Only messages with an index less than this
+        last: At most this many messages, taken from the end of the range
+
+    Returns:
+        Conversation dict with the selected messages plus message_count and
+        offset, or None if not found
+    """
+    return await _call("get_messages", conversation_id, after, before, last)
+
+
+async def save_conversation(conversation: Dict[str, Any]):
+    """
+    Save a conversation to storage.
+
+    Args:
+        conversation: Conversation dict to save
+    """
+    await _write(conversation["id"], "save_conversation", conversation)
+
+
+async def list_conversations(
+    limit: Optional[int] = None,
+    before: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    List conversations (metadata only), newest first.
+
+    Args:
+        limit: Maximum number of conversations (None for all)
+        before: Id of the last conversation on the previous page
+
+    Returns:
+        List of conversation metadata dicts
+
+    Raises:
+        ValueError: If before is not a known conversation id
+    """
+    return await _call("list_conversations", limit, before)
+
+
+async def add_user_message(conversation_id: str, content: str):
+    """
+    Add a user message to a conversation.
+
+    Args:
+        conversation_id: Conversation identifier
+        content: User message content
+    """
+    await _write(conversation_id, "add_user_message", conversation_id, content)
+
+
+async def add_assistant_message(
+    conversation_id: str,
+    stage1: List[Dict[str, Any]],
+    stage2: List[Dict[str, Any]],
+    stage3: Dict[str, Any],
+    stats: Optional[Dict[str, Any]] = None
+):
+    """
+    Add an assistant message with all 3 stages to a conversation.
+
+    Args:
+        conversation_id: Conversation identifier
+        stage1: List of individual model responses
+        stage2: List of model rankings
+        stage3: Final synthesized response
+        stats: Optional per-stage timing, token and cost stats
+    """
+    await _write(conversation_id, "add_assistant_message", conversation_id, stage1, stage2, stage3, stats)
+
+
+async def add_debate_message(
+    conversation_id: str,
+    openings: List[Dict[str, Any]],
+    rounds: List[List[Dict[str, Any]]],
+    verdict: Optional[Dict[str, Any]] = None,
+    stats: Optional[Dict[str, Any]] = None
+):
+    """
+    Add a debate mode assistant response.
+
+    Args:
+        conversation_id: Conversation identifier
+        openings: List of opening statements
+        rounds: List of round responses (each round is a list of statements)
+        verdict: Optional moderator verdict
+        stats: Optional per-phase timing, token and cost stats
+    """
+    await _write(conversation_id, "add_debate_message", conversation_id, openings, rounds, verdict, stats)
+
+
+async def update_conversation_title(conversation_id: str, title: str):
+    """
+    Update the title of a conversation.
+
+    Args:
+        conversation_id: Conversation identifier
+        title: New title for the conversation
+    """
+    await _write(conversation_id, "update_conversation_title", conversation_id, title)
@@ -0,0 +1,181 @@
+"""Storage backend interface shared by every conversation store."""
+
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
+
+
+def new_conversation(conversation_id: str) -> Dict[str, Any]:
+    """Build the record for a brand-new conversation."""
+    return {
+        "id": conversation_id,
+        "created_at": datetime.utcnow().isoformat(),
+        "title": "New Conversation",
+        "messages": []
+    }
+
+
+def conversation_mode(messages: List[Dict[str, Any]]) -> str:
+    """Detect a conversation's mode from its messages."""
+    for msg in messages:
+        if msg.get("mode") == "debate":
+            return "debate"
+    return "council"
+
+
+def select_range(
+    count: int,
+    after: Optional[int] = None,
+    before: Optional[int] = None,
+    last: Optional[int] = None
+) -> Tuple[int, int]:
+    """
+    Resolve range parameters to a [start, end) slice of message indices.
+
+    Args:
+        count: Total number of messages
+        after: Only messages with an index greater than this
+        before: Only messages with an index less than this
+        last: At most this many messages, taken from the end of the range
+
+    Returns:
+        Tuple of (start, end)
+    """
+    start = 0 if after is None else max(0, after + 1)
+    end = count if before is None else max(0, min(count, before))
+    if last is not None:
+        start = max(start, end - last)
+    return start, max(start, end)
+
+
+def conversation_metadata(conversation: Dict[str, Any]) -> Dict[str, Any]:
+    """Summarize a full conversation for the list view."""
+    messages = conversation.get("messages", [])
+    return {
+        "id": conversation["id"],
+        "created_at": conversation["created_at"],
+        "title": conversation.get("title", "New Conversation"),
+        "message_count": len(messages),
+        "mode": conversation_mode(messages)
+    }
+
+
+class StorageBackend:
+    """
+    Interface for conversation storage.
+
+    Backends implement the primitive operations; the message helpers below
+    build the message records so every backend stores the same shape.
+    """
+
+    def create_conversation(self, conversation_id: str) -> Dict[str, Any]:
+        """Create and persist a new, empty conversation."""
+        raise NotImplementedError
+
+    def get_conversation(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        """Load a full conversation, or None if not found."""
+        raise NotImplementedError
+
+    def save_conversation(self, conversation: Dict[str, Any]):
+        """Persist a full conversation, replacing any stored version."""
+        raise NotImplementedError
+
+    def get_messages(
+        self,
+        conversation_id: str,
+        after: Optional[int] = None,
+        before: Optional[int] = None,
+        last: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Load a conversation with only a range of its messages.
+
+        See select_range for the range parameters. Backends override this
+        to avoid decoding messages outside the range.
+
+        Returns:
+            Conversation dict with the selected messages, plus message_count
+            (total) and offset (index of the first returned message), or
+            None if not found
+        """
+        conversation = self.get_conversation(conversation_id)
+        if conversation is None:
+            return None
+        messages = conversation["messages"]
+        start, end = select_range(len(messages), after, before, last)
+        return {
+            **conversation,
+            "messages": messages[start:end],
+            "message_count": len(messages),
+            "offset": start
+        }
+
+    def list_conversations(
+        self,
+        limit: Optional[int] = None,
+        before: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        List conversation metadata, newest first.
+
+        Args:
+            limit: Maximum number of conversations (None for all)
+            before: Id of the last conversation on the previous page
+
+        Raises:
+            ValueError: If before is not a known conversation id
+        """
+        raise NotImplementedError
+
+    def append_message(self, conversation_id: str, message: Dict[str, Any]):
+        """Append one message. Raises ValueError if the conversation does not exist."""
+        raise NotImplementedError
+
+    def update_conversation_title(self, conversation_id: str, title: str):
+        """Update the title. Raises ValueError if the conversation does not exist."""
+        raise NotImplementedError
+
+    def add_user_message(self, conversation_id: str, content: str):
+        """Add a user message to a conversation."""
+        self.append_message(conversation_id, {
+            "role": "user",
+            "content": content
+        })
+
+    def add_assistant_message(
+        self,
+        conversation_id: str,
+        stage1: List[Dict[str, Any]],
+        stage2: List[Dict[str, Any]],
+        stage3: Dict[str, Any],
+        stats: Optional[Dict[str, Any]] = None
+    ):
+        """Add an assistant message with all 3 stages (and optional run stats) to a conversation."""
+        message = {
+            "role": "assistant",
+            "stage1": stage1,
+            "stage2": stage2,
+            "stage3": stage3
+        }
+        if stats is not None:
+            message["stats"] = stats
+        self.append_message(conversation_id, message)
+
+    def add_debate_message(
+        self,
+        conversation_id: str,
+        openings: List[Dict[str, Any]],
+        rounds: List[List[Dict[str, Any]]],
+        verdict: Optional[Dict[str, Any]] = None,
+        stats: Optional[Dict[str, Any]] = None
+    ):
+        """Add a debate mode assistant response (with optional run stats)."""
+        message = {
+            "role": "assistant",
+            "mode": "debate",
+            "openings": openings,
+            "rounds": rounds,
+            "verdict": verdict
+        }
+        if stats is not None:
+            message["stats"] = stats
+        self.append_message(conversation_id, message)
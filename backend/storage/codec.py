@@ -0,0 +1,121 @@
+"""
+Compact on-disk encoding for conversations.
+
+JSON is written minified, through orjson when it is installed. Messages
+whose encoded size reaches STORAGE_COMPRESS_MIN_BYTES are compressed with
+zstd (if the zstandard package is installed) or gzip. Compressed messages
+record their codec, so readers handle every format regardless of the
+current settings, including old uncompressed and pretty-printed files.
+"""
+
+import base64
+import gzip
+import json
+from typing import Dict, Any, Union
+from ..config import STORAGE_COMPRESSION, STORAGE_COMPRESS_MIN_BYTES
+
+try:
+    import orjson
+except ImportError:  # optional: pip install cipher[fast]
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # optional: pip install cipher[fast]
+    zstandard = None
+
+# Marker key for a compressed message inside a JSON document
+PACKED_KEY = "$z"
+
+
+def dumps(obj: Any) -> str:
+    """Encode to minified JSON text."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, separators=(",", ":"))
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Decode JSON text."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _codec() -> str:
+    if STORAGE_COMPRESSION == "zstd" and zstandard is None:
+        return "gzip"
+    return STORAGE_COMPRESSION
+
+
+def compress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=6).compress(data)
+    return gzip.compress(data, compresslevel=6)
+
+
+def decompress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("Message is zstd-compressed; install the zstandard package")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+def encode_message(message: Dict[str, Any]) -> Union[str, bytes]:
+    """
+    Encode a message for a database column.
+
+    Returns:
+        JSON text, or "<codec>:"-prefixed compressed bytes for large messages
+    """
+    text = dumps(message)
+    codec = _codec()
+    if codec == "none" or len(text) < STORAGE_COMPRESS_MIN_BYTES:
+        return text
+    return codec.encode() + b":" + compress(text.encode(), codec)
+
+
+def decode_message(value: Union[str, bytes]) -> Dict[str, Any]:
+    """Decode a value written by encode_message."""
+    if isinstance(value, bytes):
+        codec, _, data = value.partition(b":")
+        return loads(decompress(data, codec.decode()))
+    return loads(value)
+
+
+def pack_message(message: Dict[str, Any]) -> Dict[str, Any]:
+    """Compress a large message into a {"$z": codec, "data": base64} stub for JSON documents."""
+    encoded = encode_message(message)
+    if isinstance(encoded, str):
+        return message
+    codec, _, data = encoded.partition(b":")
+    return {PACKED_KEY: codec.decode(), "data": base64.b64encode(data).decode()}
+
+
+def unpack_message(message: Dict[str, Any]) -> Dict[str, Any]:
+    """Reverse pack_message; plain messages pass through unchanged."""
+    codec = message.get(PACKED_KEY)
+    if codec is None:
+        return message
+    return loads(decompress(base64.b64decode(message["data"]), codec))
+
+
+def pack_conversation(conversation: Dict[str, Any]) -> Dict[str, Any]:
+    return {**conversation, "messages": [pack_message(m) for m in conversation["messages"]]}
+
+
+def unpack_conversation(conversation: Dict[str, Any]) -> Dict[str, Any]:
+    conversation["messages"] = [unpack_message(m) for m in conversation["messages"]]
+    return conversation
+
+
+def slice_conversation(conversation: Dict[str, Any], start: int, end: int) -> Dict[str, Any]:
+    """Unpack only messages[start:end] of a packed conversation, for range reads."""
+    messages = conversation["messages"]
+    return {
+        **conversation,
+        "messages": [unpack_message(m) for m in messages[start:end]],
+        "message_count": len(messages),
+        "offset": start
+    }
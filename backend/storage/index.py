@@ -0,0 +1,125 @@
+"""Conversation metadata index with cursor-based pagination."""
+
+import os
+import sqlite3
+import threading
+from typing import List, Dict, Any, Optional, Iterable
+
+METADATA_SCHEMA = """
+CREATE TABLE IF NOT EXISTS conversations (
+    id TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    title TEXT NOT NULL,
+    mode TEXT NOT NULL DEFAULT 'council',
+    message_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS conversations_created_at ON conversations (created_at, id);
+CREATE INDEX IF NOT EXISTS conversations_mode ON conversations (mode, created_at);
+"""
+
+
+def select_page(
+    conn: sqlite3.Connection,
+    limit: Optional[int] = None,
+    before: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Read one page of a conversations table, newest first.
+
+    Args:
+        conn: Connection holding a table with the METADATA_SCHEMA layout
+        limit: Maximum number of rows (None for all)
+        before: Cursor; only conversations listed after this id are returned
+
+    Returns:
+        List of conversation metadata dicts
+    """
+    sql = "SELECT id, created_at, title, message_count, mode FROM conversations"
+    args: list = []
+    if before is not None:
+        row = conn.execute("SELECT created_at FROM conversations WHERE id = ?", (before,)).fetchone()
+        if row is None:
+            raise ValueError(f"Unknown cursor: {before}")
+        sql += " WHERE created_at < ? OR (created_at = ? AND id < ?)"
+        args += [row[0], row[0], before]
+    sql += " ORDER BY created_at DESC, id DESC"
+    if limit is not None:
+        sql += " LIMIT ?"
+        args.append(limit)
+    return [
+        {
+            "id": row[0],
+            "created_at": row[1],
+            "title": row[2],
+            "message_count": row[3],
+            "mode": row[4]
+        }
+        for row in conn.execute(sql, args)
+    ]
+
+
+class MetadataIndex:
+    """
+    SQLite index of conversation metadata for file-based backends.
+
+    Backends update it on every write so listing never has to open the
+    conversation files themselves.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(METADATA_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def upsert(self, meta: Dict[str, Any]):
+        """Insert or replace one conversation's metadata."""
+        conn = self._connect()
+        with conn:
+            self._upsert(conn, meta)
+
+    def _upsert(self, conn: sqlite3.Connection, meta: Dict[str, Any]):
+        conn.execute(
+            "INSERT OR REPLACE INTO conversations (id, created_at, title, mode, message_count)"
+            " VALUES (?, ?, ?, ?, ?)",
+            (meta["id"], meta["created_at"], meta["title"], meta["mode"], meta["message_count"]),
+        )
+
+    def record_append(self, conversation_id: str, mode: Optional[str] = None):
+        """Count one appended message, switching the mode for debate messages."""
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "UPDATE conversations SET message_count = message_count + 1,"
+                " mode = CASE WHEN ? = 'debate' THEN 'debate' ELSE mode END"
+                " WHERE id = ?",
+                (mode, conversation_id),
+            )
+
+    def set_title(self, conversation_id: str, title: str):
+        conn = self._connect()
+        with conn:
+            conn.execute("UPDATE conversations SET title = ? WHERE id = ?", (title, conversation_id))
+
+    def rebuild(self, metas: Iterable[Dict[str, Any]]):
+        """Replace the whole index with the given metadata."""
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM conversations")
+            for meta in metas:
+                self._upsert(conn, meta)
+
+    def is_empty(self) -> bool:
+        return self._connect().execute("SELECT 1 FROM conversations LIMIT 1").fetchone() is None
+
+    def list(self, limit: Optional[int] = None, before: Optional[str] = None) -> List[Dict[str, Any]]:
+        return select_page(self._connect(), limit, before)
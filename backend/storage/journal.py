@@ -0,0 +1,167 @@
+"""Append-only JSON Lines journal storage (one journal per conversation)."""
+
+import os
+from typing import List, Dict, Any, Optional, Tuple
+from . import codec
+from .base import conversation_metadata, select_range
+from .json_files import JSONFileStorage
+
+
+def _encode(record: Dict[str, Any]) -> str:
+    if record["op"] == "message":
+        record = {**record, "message": codec.pack_message(record["message"])}
+    elif record["op"] == "snapshot":
+        record = {**record, "conversation": codec.pack_conversation(record["conversation"])}
+    return codec.dumps(record) + "\n"
+
+
+class JournalStorage(JSONFileStorage):
+    """
+    Stores each conversation as a journal of records in {id}.jsonl.
+
+    Every write appends one record ("snapshot", "message" or "title"), so
+    writes cost O(record) and concurrent appends never overwrite each other.
+    Loading replays the last snapshot plus the records after it. Once the
+    tail grows past compact_after records, the journal is rewritten as a
+    single snapshot. Conversations saved by the JSON backend are read as-is
+    and converted on their first write.
+    """
+
+    def __init__(self, data_dir: str, compact_after: int = 50):
+        self.compact_after = compact_after
+        self._tail_lengths: Dict[str, int] = {}
+        super().__init__(data_dir)
+
+    def get_journal_path(self, conversation_id: str) -> str:
+        """Get the journal path for a conversation."""
+        return os.path.join(self.data_dir, f"{conversation_id}.jsonl")
+
+    def conversation_ids(self) -> List[str]:
+        self.ensure_data_dir()
+        ids = set()
+        for filename in os.listdir(self.data_dir):
+            stem, ext = os.path.splitext(filename)
+            if ext in ('.json', '.jsonl'):
+                ids.add(stem)
+        return list(ids)
+
+    def _replay(
+        self,
+        conversation_id: str,
+        unpack: bool = True
+    ) -> Tuple[Optional[Dict[str, Any]], int]:
+        """
+        Rebuild a conversation from its journal; returns it and the tail length.
+
+        With unpack=False, compressed messages are left packed for the caller.
+        """
+        path = self.get_journal_path(conversation_id)
+        if not os.path.exists(path):
+            return None, 0
+
+        conversation = None
+        tail = 0
+        with open(path, 'r') as f:
+            for line in f:
+                try:
+                    record = codec.loads(line)
+                except ValueError:
+                    # A torn final line from an interrupted write
+                    continue
+                op = record["op"]
+                if op == "snapshot":
+                    conversation = record["conversation"]
+                    tail = 0
+                    continue
+                tail += 1
+                if conversation is None:
+                    continue
+                if op == "message":
+                    conversation["messages"].append(record["message"])
+                elif op == "title":
+                    conversation["title"] = record["title"]
+        if conversation is not None and unpack:
+            codec.unpack_conversation(conversation)
+        return conversation, tail
+
+    def get_conversation(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        conversation, tail = self._replay(conversation_id)
+        if conversation is not None:
+            self._tail_lengths[conversation_id] = tail
+            return conversation
+        # Fall back to a conversation written by the JSON backend
+        return super().get_conversation(conversation_id)
+
+    def get_messages(
+        self,
+        conversation_id: str,
+        after: Optional[int] = None,
+        before: Optional[int] = None,
+        last: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        conversation, tail = self._replay(conversation_id, unpack=False)
+        if conversation is None:
+            return super().get_messages(conversation_id, after, before, last)
+        self._tail_lengths[conversation_id] = tail
+        # Only decompress the messages being returned
+        return codec.slice_conversation(conversation, *select_range(len(conversation["messages"]), after, before, last))
+
+    def save_conversation(self, conversation: Dict[str, Any]):
+        """Write the conversation as a fresh single-snapshot journal."""
+        self.ensure_data_dir()
+
+        path = self.get_journal_path(conversation['id'])
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(_encode({"op": "snapshot", "conversation": conversation}))
+        os.replace(tmp_path, path)
+        self._tail_lengths[conversation['id']] = 0
+
+        legacy_path = self.get_conversation_path(conversation['id'])
+        if os.path.exists(legacy_path):
+            os.remove(legacy_path)
+        self.index.upsert(conversation_metadata(conversation))
+
+    def _append_record(self, conversation_id: str, record: Dict[str, Any]):
+        path = self.get_journal_path(conversation_id)
+        if not os.path.exists(path):
+            # Nothing journaled yet: convert a legacy file, or fail
+            legacy = super().get_conversation(conversation_id)
+            if legacy is None:
+                raise ValueError(f"Conversation {conversation_id} not found")
+            self.save_conversation(legacy)
+
+        tail = self._tail_lengths.get(conversation_id)
+        if tail is None:
+            with open(path, 'r') as f:
+                tail = sum(1 for _ in f) - 1
+
+        with open(path, 'a+b') as f:
+            # Start on a fresh line if a previous write was torn
+            f.seek(0, os.SEEK_END)
+            if f.tell() > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    f.write(b"\n")
+            f.write(_encode(record).encode())
+        self._tail_lengths[conversation_id] = tail + 1
+
+    def _maybe_compact(self, conversation_id: str):
+        if self._tail_lengths.get(conversation_id, 0) >= self.compact_after:
+            self.compact(conversation_id)
+
+    def compact(self, conversation_id: str):
+        """Fold the journal tail into a single snapshot record."""
+        conversation, _ = self._replay(conversation_id)
+        if conversation is not None:
+            self.save_conversation(conversation)
+
+    def append_message(self, conversation_id: str, message: Dict[str, Any]):
+        self._append_record(conversation_id, {"op": "message", "message": message})
+        self.index.record_append(conversation_id, message.get("mode"))
+        self._maybe_compact(conversation_id)
+
+    def update_conversation_title(self, conversation_id: str, title: str):
+        self._append_record(conversation_id, {"op": "title", "title": title})
+        self.index.set_title(conversation_id, title)
+        self._maybe_compact(conversation_id)
@@ -0,0 +1,113 @@
+"""JSON-based storage for conversations (one file per conversation)."""
+
+import os
+from typing import List, Dict, Any, Optional
+from pathlib import Path
+from . import codec
+from .base import StorageBackend, new_conversation, conversation_metadata, select_range
+from .index import MetadataIndex
+
+INDEX_FILENAME = ".index.sqlite3"
+
+
+class JSONFileStorage(StorageBackend):
+    """
+    Stores each conversation as a JSON document in data_dir.
+
+    Listing reads a metadata index kept next to the files; the index is
+    rebuilt from the files when it is missing.
+    """
+
+    def __init__(self, data_dir: str):
+        self.data_dir = data_dir
+        index_path = os.path.join(data_dir, INDEX_FILENAME)
+        fresh = not os.path.exists(index_path)
+        self.index = MetadataIndex(index_path)
+        if fresh or self.index.is_empty():
+            self.reindex()
+
+    def conversation_ids(self) -> List[str]:
+        """Ids of every conversation stored on disk."""
+        self.ensure_data_dir()
+        return [
+            filename[:-len('.json')]
+            for filename in os.listdir(self.data_dir)
+            if filename.endswith('.json')
+        ]
+
+    def reindex(self):
+        """Rebuild the metadata index by scanning every conversation file."""
+        self.index.rebuild(
+            conversation_metadata(self.get_conversation(conversation_id))
+            for conversation_id in self.conversation_ids()
+        )
+
+    def ensure_data_dir(self):
+        """Ensure the data directory exists."""
+        Path(self.data_dir).mkdir(parents=True, exist_ok=True)
+
+    def get_conversation_path(self, conversation_id: str) -> str:
+        """Get the file path for a conversation."""
+        return os.path.join(self.data_dir, f"{conversation_id}.json")
+
+    def create_conversation(self, conversation_id: str) -> Dict[str, Any]:
+        conversation = new_conversation(conversation_id)
+        self.save_conversation(conversation)
+        return conversation
+
+    def get_conversation(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        path = self.get_conversation_path(conversation_id)
+
+        if not os.path.exists(path):
+            return None
+
+        with open(path, 'rb') as f:
+            return codec.unpack_conversation(codec.loads(f.read()))
+
+    def get_messages(
+        self,
+        conversation_id: str,
+        after: Optional[int] = None,
+        before: Optional[int] = None,
+        last: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        path = self.get_conversation_path(conversation_id)
+
+        if not os.path.exists(path):
+            return None
+
+        with open(path, 'rb') as f:
+            conversation = codec.loads(f.read())
+        # Only decompress the messages being returned
+        return codec.slice_conversation(conversation, *select_range(len(conversation["messages"]), after, before, last))
+
+    def save_conversation(self, conversation: Dict[str, Any]):
+        self.ensure_data_dir()
+
+        path = self.get_conversation_path(conversation['id'])
+        with open(path, 'w') as f:
+            f.write(codec.dumps(codec.pack_conversation(conversation)))
+        self.index.upsert(conversation_metadata(conversation))
+
+    def list_conversations(
+        self,
+        limit: Optional[int] = None,
+        before: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        return self.index.list(limit, before)
+
+    def append_message(self, conversation_id: str, message: Dict[str, Any]):
+        conversation = self.get_conversation(conversation_id)
+        if conversation is None:
+            raise ValueError(f"Conversation {conversation_id} not found")
+
+        conversation["messages"].append(message)
+        self.save_conversation(conversation)
+
+    def update_conversation_title(self, conversation_id: str, title: str):
+        conversation = self.get_conversation(conversation_id)
+        if conversation is None:
+            raise ValueError(f"Conversation {conversation_id} not found")
+
+        conversation["title"] = title
+        self.save_conversation(conversation)
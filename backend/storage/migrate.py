@@ -0,0 +1,79 @@
+"""
+Rewrite stored conversations with the compact encoding.
+
+Reads every conversation in the data directory (pretty-printed or compact
+.json documents and .jsonl journals) and writes it back minified, with
+large messages compressed. With --to, conversations are moved to another
+backend instead.
+
+Usage:
+    uv run python -m backend.storage.migrate
+    uv run python -m backend.storage.migrate --to sqlite
+"""
+
+import argparse
+import os
+from ..config import DATA_DIR, STORAGE_SQLITE_PATH
+from .journal import JournalStorage
+from .json_files import JSONFileStorage
+from .sqlite import SQLiteStorage
+
+
+def directory_size(path: str) -> int:
+    """Total size of the conversation files in a directory, in bytes."""
+    if not os.path.isdir(path):
+        return 0
+    return sum(
+        os.path.getsize(os.path.join(path, name))
+        for name in os.listdir(path)
+        if name.endswith(('.json', '.jsonl'))
+    )
+
+
+def migrate(data_dir: str, target: str, sqlite_path: str) -> int:
+    """
+    Rewrite every conversation in data_dir into the target format.
+
+    Args:
+        data_dir: Directory holding .json/.jsonl conversation files
+        target: "json", "jsonl" or "sqlite"
+        sqlite_path: Database path when target is "sqlite"
+
+    Returns:
+        Number of conversations migrated
+    """
+    # The journal backend reads both file formats
+    source = JournalStorage(data_dir)
+    conversation_ids = source.conversation_ids()
+
+    if target == "sqlite":
+        return SQLiteStorage(sqlite_path).import_conversations(
+            source.get_conversation(conversation_id) for conversation_id in conversation_ids
+        )
+
+    writer = source if target == "jsonl" else JSONFileStorage(data_dir)
+    for conversation_id in conversation_ids:
+        conversation = source.get_conversation(conversation_id)
+        writer.save_conversation(conversation)
+        if target == "json":
+            journal_path = source.get_journal_path(conversation_id)
+            if os.path.exists(journal_path):
+                os.remove(journal_path)
+    return len(conversation_ids)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rewrite stored conversations with the compact encoding.")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--to", choices=["json", "jsonl", "sqlite"], default="json", help="target format")
+    parser.add_argument("--sqlite-path", default=STORAGE_SQLITE_PATH)
+    args = parser.parse_args()
+
+    before = directory_size(args.data_dir)
+    count = migrate(args.data_dir, args.to, args.sqlite_path)
+    after = os.path.getsize(args.sqlite_path) if args.to == "sqlite" else directory_size(args.data_dir)
+    print(f"Migrated {count} conversations to {args.to}: {before:,} -> {after:,} bytes")
+
+
+if __name__ == "__main__":
+    main()
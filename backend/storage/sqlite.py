@@ -0,0 +1,184 @@
+"""SQLite storage for conversations (WAL mode, one row per message)."""
+
+import os
+import sqlite3
+import threading
+from typing import List, Dict, Any, Optional, Iterable
+from . import codec
+from .base import StorageBackend, new_conversation, conversation_mode, select_range
+from .index import METADATA_SCHEMA, select_page
+
+SCHEMA = METADATA_SCHEMA + """
+CREATE TABLE IF NOT EXISTS messages (
+    conversation_id TEXT NOT NULL REFERENCES conversations (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    role TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (conversation_id, position)
+);
+"""
+
+
+class SQLiteStorage(StorageBackend):
+    """
+    Stores conversations and messages in separate tables.
+
+    Appending a message is a single-row insert plus a counter update on the
+    conversation row, so write cost does not grow with conversation length.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def create_conversation(self, conversation_id: str) -> Dict[str, Any]:
+        conversation = new_conversation(conversation_id)
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT INTO conversations (id, created_at, title) VALUES (?, ?, ?)",
+                (conversation["id"], conversation["created_at"], conversation["title"]),
+            )
+        return conversation
+
+    def get_conversation(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT id, created_at, title FROM conversations WHERE id = ?",
+            (conversation_id,),
+        ).fetchone()
+        if row is None:
+            return None
+        messages = conn.execute(
+            "SELECT data FROM messages WHERE conversation_id = ? ORDER BY position",
+            (conversation_id,),
+        ).fetchall()
+        return {
+            "id": row[0],
+            "created_at": row[1],
+            "title": row[2],
+            "messages": [codec.decode_message(data) for (data,) in messages]
+        }
+
+    def get_messages(
+        self,
+        conversation_id: str,
+        after: Optional[int] = None,
+        before: Optional[int] = None,
+        last: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT id, created_at, title, message_count FROM conversations WHERE id = ?",
+            (conversation_id,),
+        ).fetchone()
+        if row is None:
+            return None
+        start, end = select_range(row[3], after, before, last)
+        messages = conn.execute(
+            "SELECT data FROM messages WHERE conversation_id = ? AND position >= ? AND position < ?"
+            " ORDER BY position",
+            (conversation_id, start, end),
+        ).fetchall()
+        return {
+            "id": row[0],
+            "created_at": row[1],
+            "title": row[2],
+            "messages": [codec.decode_message(data) for (data,) in messages],
+            "message_count": row[3],
+            "offset": start
+        }
+
+    def save_conversation(self, conversation: Dict[str, Any]):
+        conn = self._connect()
+        with conn:
+            self._write_conversation(conn, conversation)
+
+    def _write_conversation(self, conn: sqlite3.Connection, conversation: Dict[str, Any]):
+        messages = conversation.get("messages", [])
+        conn.execute(
+            "INSERT OR REPLACE INTO conversations (id, created_at, title, mode, message_count)"
+            " VALUES (?, ?, ?, ?, ?)",
+            (
+                conversation["id"],
+                conversation["created_at"],
+                conversation.get("title", "New Conversation"),
+                conversation_mode(messages),
+                len(messages),
+            ),
+        )
+        conn.execute("DELETE FROM messages WHERE conversation_id = ?", (conversation["id"],))
+        conn.executemany(
+            "INSERT INTO messages (conversation_id, position, role, data) VALUES (?, ?, ?, ?)",
+            [
+                (conversation["id"], position, msg.get("role", ""), codec.encode_message(msg))
+                for position, msg in enumerate(messages)
+            ],
+        )
+
+    def import_conversations(self, conversations: Iterable[Dict[str, Any]]) -> int:
+        """
+        Bulk-load full conversations in one transaction.
+
+        Args:
+            conversations: Conversation dicts, e.g. from another backend
+
+        Returns:
+            Number of conversations imported
+        """
+        conn = self._connect()
+        count = 0
+        with conn:
+            for conversation in conversations:
+                self._write_conversation(conn, conversation)
+                count += 1
+        return count
+
+    def list_conversations(
+        self,
+        limit: Optional[int] = None,
+        before: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        return select_page(self._connect(), limit, before)
+
+    def append_message(self, conversation_id: str, message: Dict[str, Any]):
+        conn = self._connect()
+        with conn:
+            # The position comes from the conversation row inside the same
+            # write transaction, so concurrent appends cannot collide.
+            cursor = conn.execute(
+                "INSERT INTO messages (conversation_id, position, role, data)"
+                " SELECT id, message_count, ?, ? FROM conversations WHERE id = ?",
+                (message.get("role", ""), codec.encode_message(message), conversation_id),
+            )
+            if cursor.rowcount == 0:
+                raise ValueError(f"Conversation {conversation_id} not found")
+            conn.execute(
+                "UPDATE conversations SET message_count = message_count + 1,"
+                " mode = CASE WHEN ? = 'debate' THEN 'debate' ELSE mode END"
+                " WHERE id = ?",
+                (message.get("mode"), conversation_id),
+            )
+
+    def update_conversation_title(self, conversation_id: str, title: str):
+        conn = self._connect()
+        with conn:
+            cursor = conn.execute(
+                "UPDATE conversations SET title = ? WHERE id = ?",
+                (title, conversation_id),
+            )
+        if cursor.rowcount == 0:
+            raise ValueError(f"Conversation {conversation_id} not found")
@@ -0,0 +1,111 @@
+"""Per-call timing, token usage and cost, aggregated per stage."""
+
+from typing import List, Dict, Any, Optional
+
+
+def parse_usage(usage: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """
+    Normalize an OpenRouter usage block.
+
+    Args:
+        usage: The 'usage' object from a completion response, if any
+
+    Returns:
+        Dict with prompt/completion/total/cached token counts and cost, or None
+    """
+    if not usage:
+        return None
+    details = usage.get("prompt_tokens_details") or {}
+    return {
+        "prompt_tokens": usage.get("prompt_tokens") or 0,
+        "completion_tokens": usage.get("completion_tokens") or 0,
+        "total_tokens": usage.get("total_tokens") or 0,
+        "cached_tokens": details.get("cached_tokens") or 0,
+        "cost": usage.get("cost") or 0.0
+    }
+
+
+def call_telemetry(response: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Pick the telemetry fields of a model response for storing with a stage result.
+
+    Returns:
+        Dict with 'timing' and 'usage' (either may be None), plus 'cached' for cache hits
+    """
+    telemetry = {
+        "timing": response.get("timing"),
+        "usage": response.get("usage")
+    }
+    if response.get("cached"):
+        telemetry["cached"] = True
+    return telemetry
+
+
+def summarize_stage(
+    results: List[Dict[str, Any]],
+    duration: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Aggregate the telemetry of one stage's results.
+
+    Cache hits count as calls but add no tokens or cost.
+
+    Args:
+        results: Stage results carrying 'timing'/'usage' (see call_telemetry)
+        duration: Wall-clock seconds of the stage. When None (e.g. stages that
+            overlap in pipelined mode), the slowest call is used instead.
+
+    Returns:
+        Dict with duration, call counts, token totals, cost and the slowest member
+    """
+    summary = {
+        "duration": 0.0,
+        "calls": len(results),
+        "cached_calls": 0,
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+        "cached_tokens": 0,
+        "cost": 0.0,
+        "queue_wait": 0.0,
+        "slowest": None
+    }
+    slowest_total = -1.0
+    for result in results:
+        if result.get("cached"):
+            summary["cached_calls"] += 1
+        else:
+            usage = result.get("usage") or {}
+            for field in ("prompt_tokens", "completion_tokens", "cached_tokens", "cost"):
+                summary[field] += usage.get(field, 0)
+        timing = result.get("timing") or {}
+        summary["queue_wait"] += timing.get("queue_wait", 0.0)
+        if timing.get("total", 0.0) > slowest_total:
+            slowest_total = timing.get("total", 0.0)
+            summary["slowest"] = {
+                "name": result.get("name") or result.get("persona") or result.get("moderator"),
+                "model": result.get("model"),
+                "total": slowest_total
+            }
+
+    summary["duration"] = round(duration if duration is not None else max(slowest_total, 0.0), 3)
+    summary["queue_wait"] = round(summary["queue_wait"], 3)
+    summary["cost"] = round(summary["cost"], 6)
+    return summary
+
+
+def summarize_run(stages: Dict[str, Dict[str, Any]], duration: float) -> Dict[str, Any]:
+    """
+    Combine stage summaries into totals for a whole council or debate.
+
+    Args:
+        stages: Stage name -> summarize_stage output
+        duration: Wall-clock seconds of the whole run
+
+    Returns:
+        Dict with the stages and their totals
+    """
+    totals = {"duration": round(duration, 3)}
+    for field in ("calls", "cached_calls", "prompt_tokens", "completion_tokens", "cached_tokens"):
+        totals[field] = sum(stage[field] for stage in stages.values())
+    totals["cost"] = round(sum(stage["cost"] for stage in stages.values()), 6)
+    return {"stages": stages, "total": totals}
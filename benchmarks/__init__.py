@@ -0,0 +1 @@
+"""Benchmarks for Cipher; run modules from the project root with python -m benchmarks.<name>."""
@@ -0,0 +1,79 @@
+"""Helpers shared by the benchmark scripts."""
+
+import asyncio
+import resource
+import sys
+import time
+from typing import List, Dict, Optional
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of a list of numbers (0.0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def latency_summary(seconds: List[float]) -> Dict[str, float]:
+    """p50/p95/p99/max of a list of durations, in milliseconds."""
+    return {
+        "p50_ms": round(percentile(seconds, 0.5) * 1000, 2),
+        "p95_ms": round(percentile(seconds, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(seconds, 0.99) * 1000, 2),
+        "max_ms": round(max(seconds, default=0.0) * 1000, 2),
+    }
+
+
+def build_backend(name: str, directory: str):
+    """Build a storage backend ("json", "jsonl" or "sqlite") rooted in a scratch directory."""
+    # Imported here so scripts can set CIPHER_* variables before backend.config loads
+    from backend.storage.journal import JournalStorage
+    from backend.storage.json_files import JSONFileStorage
+    from backend.storage.sqlite import SQLiteStorage
+
+    if name == "json":
+        return JSONFileStorage(directory)
+    if name == "jsonl":
+        return JournalStorage(directory)
+    return SQLiteStorage(f"{directory}/conversations.sqlite3")
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes on Linux
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+
+class LoopLagProbe:
+    """
+    Measures event-loop lag: how late a periodic sleep wakes up.
+
+    Use as an async context manager around the workload.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.lags: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self):
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.lags.append(time.perf_counter() - start - self.interval)
+
+    async def __aenter__(self) -> "LoopLagProbe":
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    def summary(self) -> Dict[str, float]:
+        return latency_summary(self.lags)
@@ -0,0 +1,251 @@
+"""
+End-to-end load test of councils and debates against a mock OpenRouter.
+
+Starts benchmarks.mock_openrouter on a free local port, points the backend
+at it and runs a fixed number of requests at each concurrency level.
+Scenarios:
+
+    council  run_full_council called directly (orchestration only)
+    stream   full streamed council through the FastAPI app, storage included
+    debate   streamed debate (vector vs phantom, arbiter verdict)
+
+Every request uses a unique query so the response cache and request
+coalescing never short-circuit upstream calls. Reports end-to-end latency
+percentiles, throughput, event-loop lag, peak RSS and the share of prompt
+tokens served from the (simulated) provider prompt cache.
+
+Usage:
+    uv run python -m benchmarks.council_load --concurrency 1,4,16 --time-scale 0.1
+    uv run python -m benchmarks.council_load --scenario stream --json results.json
+    uv run python -m benchmarks.council_load --scenario council \
+        --members "Tech Support Specialist,Business Risk & Compliance,Strategic Advisory,Implementation Specialist"
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+
+from benchmarks.common import LoopLagProbe, latency_summary, peak_rss_mb
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_mock(port: int, args) -> subprocess.Popen:
+    """Start the mock server and wait until it accepts connections."""
+    command = [
+        sys.executable, "-m", "benchmarks.mock_openrouter",
+        "--port", str(port), "--time-scale", str(args.time_scale),
+    ]
+    if args.profile:
+        command += ["--profile", args.profile]
+    if args.seed is not None:
+        command += ["--seed", str(args.seed)]
+    process = subprocess.Popen(command)
+
+    deadline = time.monotonic() + 15
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("mock server exited during startup")
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("mock server did not start")
+
+
+def configure_backend(port: int, data_dir: str):
+    """Point the backend at the mock server. Must run before importing backend."""
+    os.environ["OPENROUTER_API_URL"] = f"http://127.0.0.1:{port}/api/v1/chat/completions"
+    os.environ.setdefault("OPENROUTER_API_KEY", "benchmark")
+    os.environ["CIPHER_CACHE"] = "0"
+    os.environ["CIPHER_MODEL_RATE_LIMIT"] = "0"
+    os.environ["CIPHER_STORAGE_BACKEND"] = "sqlite"
+    os.environ["CIPHER_STORAGE_SQLITE_PATH"] = os.path.join(data_dir, "conversations.sqlite3")
+
+
+async def read_stream(client, conversation_id: str, payload: dict) -> dict:
+    """Consume one SSE response, failing on an error event. Returns the run stats."""
+    url = f"/api/conversations/{conversation_id}/message/stream"
+    stats = None
+    async with client.stream("POST", url, json=payload) as response:
+        response.raise_for_status()
+        async for line in response.aiter_lines():
+            if not line.startswith("data: "):
+                continue
+            event = json.loads(line[6:])
+            if event["type"] == "error":
+                raise RuntimeError(event.get("message"))
+            if event["type"] == "complete":
+                stats = event.get("stats")
+    return stats
+
+
+def make_scenario(
+    name: str, client, orchestration: str, members: list = None, review_format: str = None, early_exit: str = None
+):
+    """Return a coroutine function that runs one request of the scenario and returns its stats."""
+    from backend.council import run_full_council
+    from backend.personas import get_persona_by_name
+
+    council_models = [get_persona_by_name(member) for member in members] if members else None
+
+    async def council(query: str):
+        stage1, _, _, metadata = await run_full_council(
+            query, council_models, orchestration=orchestration, review_format=review_format,
+            early_exit=early_exit
+        )
+        if not stage1:
+            raise RuntimeError("all council members failed")
+        return metadata.get("stats")
+
+    async def stream(query: str):
+        conversation = (await client.post("/api/conversations", json={})).json()
+        payload = {
+            "content": query,
+            "orchestration": orchestration,
+            "review_format": review_format,
+            "early_exit": early_exit,
+        }
+        if members:
+            payload["council_members"] = members
+        return await read_stream(client, conversation["id"], payload)
+
+    async def debate(query: str):
+        conversation = (await client.post("/api/conversations", json={})).json()
+        return await read_stream(client, conversation["id"], {
+            "content": query,
+            "debater_for": "vector",
+            "debater_against": "phantom",
+            "num_rounds": 2,
+            "moderator": "arbiter",
+        })
+
+    return {"council": council, "stream": stream, "debate": debate}[name]
+
+
+def prompt_tokens(runs: list) -> dict:
+    """Prompt tokens and provider cache hits per stage, summed over runs."""
+    totals = {}
+    for stats in runs:
+        for stage, summary in (stats or {}).get("stages", {}).items():
+            stage_totals = totals.setdefault(stage, {"prompt_tokens": 0, "cached_tokens": 0})
+            stage_totals["prompt_tokens"] += summary["prompt_tokens"]
+            stage_totals["cached_tokens"] += summary["cached_tokens"]
+    for stage_totals in totals.values():
+        prompt = stage_totals["prompt_tokens"]
+        stage_totals["cached_ratio"] = round(stage_totals["cached_tokens"] / prompt, 3) if prompt else 0.0
+    return totals
+
+
+async def run_level(run_one, concurrency: int, requests: int) -> dict:
+    """Run `requests` requests with at most `concurrency` in flight."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, runs, errors = [], [], 0
+
+    async def one():
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                runs.append(await run_one(f"Benchmark question {uuid.uuid4()}: how should we secure the build pipeline?"))
+                latencies.append(time.perf_counter() - started)
+            except Exception as e:
+                errors += 1
+                print(f"  request failed: {e}", file=sys.stderr)
+
+    started = time.perf_counter()
+    async with LoopLagProbe() as probe:
+        await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "concurrency": concurrency,
+        "requests": requests,
+        "errors": errors,
+        "wall_s": round(elapsed, 3),
+        "per_second": round(len(latencies) / elapsed, 3) if elapsed else 0.0,
+        "latency": latency_summary(latencies),
+        "loop_lag": probe.summary(),
+        "peak_rss_mb": peak_rss_mb(),
+        "prompt_tokens": prompt_tokens(runs),
+    }
+
+
+async def run(args) -> list:
+    import httpx
+    from backend.main import app
+
+    results = []
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            for scenario in args.scenario.split(","):
+                run_one = make_scenario(
+                    scenario, client, args.orchestration, args.members, args.review_format, args.early_exit
+                )
+                for concurrency in args.concurrency:
+                    requests = args.requests or max(4, concurrency * 2)
+                    result = {"scenario": scenario, **await run_level(run_one, concurrency, requests)}
+                    results.append(result)
+                    latency, lag = result["latency"], result["loop_lag"]
+                    print(
+                        f"{scenario:>8}  c={concurrency:<4} n={requests:<4} err={result['errors']:<3}"
+                        f" p50 {latency['p50_ms']:8.0f}ms  p95 {latency['p95_ms']:8.0f}ms"
+                        f"  p99 {latency['p99_ms']:8.0f}ms  {result['per_second']:6.2f}/s"
+                        f"  lag p99 {lag['p99_ms']:6.1f}ms  rss {result['peak_rss_mb']:.0f}MB"
+                    )
+                    cached = "  ".join(
+                        f"{stage} {totals['cached_ratio']:.0%}"
+                        for stage, totals in result["prompt_tokens"].items()
+                    )
+                    print(f"{'':>8}  prompt cache hits: {cached}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scenario", default="council,stream,debate", help="comma list of council, stream, debate")
+    parser.add_argument("--concurrency", default="1,4,16", help="comma list of concurrency levels")
+    parser.add_argument("--requests", type=int, help="requests per level (default: 2x concurrency, at least 4)")
+    parser.add_argument("--orchestration", choices=["sequential", "pipelined"], default="sequential")
+    parser.add_argument("--review-format", choices=["text", "json"], help="stage 2 review format (default: config)")
+    parser.add_argument("--early-exit", choices=["off", "certain", "stable"], help="stage 2 early exit (default: config)")
+    parser.add_argument("--members", help="comma list of council persona names (default: the default council)")
+    parser.add_argument("--profile", help="JSON file with mock model profiles")
+    parser.add_argument("--time-scale", type=float, default=0.1, help="multiplier for simulated upstream delays")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+    args.concurrency = [int(level) for level in args.concurrency.split(",")]
+    args.members = args.members.split(",") if args.members else None
+
+    port = free_port()
+    mock = start_mock(port, args)
+    try:
+        with tempfile.TemporaryDirectory() as data_dir:
+            configure_backend(port, data_dir)
+            results = asyncio.run(run(args))
+    finally:
+        mock.terminate()
+        mock.wait()
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""
+Local stand-in for the OpenRouter chat completions API.
+
+Serves /api/v1/chat/completions with simulated latency, token streaming and
+failures so the backend can be load-tested without network or API keys.
+Each model gets a profile:
+
+    {
+        "ttft": {"median": 0.8, "sigma": 0.4},   # lognormal time to first token (s)
+        "tokens": 250,                             # completion length
+        "tokens_per_second": 60,                   # streaming rate
+        "chunk_tokens": 4,                         # tokens per SSE chunk
+        "failure_rate": 0.0,                       # share of requests that fail
+        "failure_status": 503,                     # status code of a failure
+        "prompt_cache": "auto",                    # "auto", "explicit" or "none"
+        "ranking_agreement": 0.0                   # share of reviews that follow the consensus
+    }
+
+Profiles come from a JSON file {"default": {...}, "models": {"<model>": {...}}};
+missing fields fall back to DEFAULT_PROFILE. --time-scale multiplies every
+delay, e.g. 0.1 for a ten times faster run with the same shape.
+
+Stage 2 prompts get a well-formed FINAL RANKING of the labels they contain,
+in random order, so aggregation runs on realistic input; requests with a
+json_schema response_format get a short JSON review instead. With
+ranking_agreement, that share of reviews instead ranks the labels in a fixed
+consensus order, so councils can be made to agree.
+
+Prompt caching is simulated per model: a request whose leading messages
+match an earlier request reports those tokens as cached. "auto" caches every
+prefix of at least 1024 tokens (OpenAI style), "explicit" only prefixes
+ending at a cache_control breakpoint (Anthropic style). Without a setting,
+anthropic/ and google/gemini models are explicit and the rest auto.
+
+Usage:
+    uv run python -m benchmarks.mock_openrouter --port 8787
+    OPENROUTER_API_URL=http://127.0.0.1:8787/api/v1/chat/completions uv run python -m backend.main
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import re
+from typing import Dict, Any
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import ClientDisconnect, Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+DEFAULT_PROFILE = {
+    "ttft": {"median": 0.8, "sigma": 0.4},
+    "tokens": 250,
+    "tokens_per_second": 60,
+    "chunk_tokens": 4,
+    "failure_rate": 0.0,
+    "failure_status": 503,
+    "prompt_cache": None,
+    "ranking_agreement": 0.0,
+}
+EXPLICIT_CACHE_PROVIDERS = ("anthropic/", "google/gemini")
+MIN_CACHE_TOKENS = 1024
+
+LABEL_PATTERN = re.compile(r"^(Response from [^:\n]+):$", re.MULTILINE)
+FILLER_WORDS = "the council weighs risk controls threat model evidence and tradeoffs".split()
+
+
+def load_profiles(path: str = None) -> Dict[str, Any]:
+    """Load model profiles from a JSON file, or use the defaults."""
+    config = {"default": {}, "models": {}}
+    if path:
+        with open(path) as f:
+            config.update(json.load(f))
+    return config
+
+
+def create_app(profiles: Dict[str, Any], time_scale: float = 1.0, seed: int = None) -> Starlette:
+    """
+    Build the mock API.
+
+    Args:
+        profiles: Output of load_profiles
+        time_scale: Multiplier applied to every simulated delay
+        seed: Optional random seed for reproducible runs
+    """
+    rng = random.Random(seed)
+    stats = {"requests": 0, "failures": 0, "prompt_tokens": 0, "cached_tokens": 0}
+    cached_prefixes = set()
+
+    def profile_for(model: str) -> Dict[str, Any]:
+        profile = {**DEFAULT_PROFILE, **profiles.get("default", {}), **profiles.get("models", {}).get(model, {})}
+        if profile["prompt_cache"] is None:
+            profile["prompt_cache"] = "explicit" if model.startswith(EXPLICIT_CACHE_PROVIDERS) else "auto"
+        return profile
+
+    def message_text(message) -> str:
+        content = message.get("content") or ""
+        if isinstance(content, list):
+            return "".join(part.get("text", "") for part in content)
+        return content
+
+    def has_breakpoint(message) -> bool:
+        content = message.get("content")
+        return isinstance(content, list) and any("cache_control" in part for part in content)
+
+    def cached_prefix_tokens(model: str, messages, mode: str) -> int:
+        """Tokens of the longest message prefix served from the simulated cache."""
+        if mode == "none":
+            return 0
+        digest = hashlib.sha256(model.encode())
+        tokens = cached = 0
+        for message in messages:
+            digest.update(json.dumps(message, sort_keys=True).encode())
+            tokens += len(message_text(message)) // 4
+            key = digest.copy().hexdigest()
+            cacheable = has_breakpoint(message) if mode == "explicit" else True
+            if key in cached_prefixes:
+                cached = tokens
+            elif cacheable and tokens >= MIN_CACHE_TOKENS:
+                cached_prefixes.add(key)
+        return cached
+
+    def review_order(labels, agreement: float):
+        """Shuffle labels in place, or put them in the consensus order."""
+        if rng.random() < agreement:
+            labels.sort(key=lambda label: hashlib.sha256(label.encode()).hexdigest())
+        else:
+            rng.shuffle(labels)
+
+    def completion_text(messages, tokens: int, response_format=None, agreement: float = 0.0) -> str:
+        prompt = "\n".join(message_text(message) for message in messages)
+        body = " ".join(rng.choice(FILLER_WORDS) for _ in range(tokens))
+        labels = LABEL_PATTERN.findall(prompt)
+        if response_format and response_format.get("type") == "json_schema" and labels:
+            review_order(labels, agreement)
+            reviews = [
+                {"label": label, "score": round(rng.uniform(3, 9.5), 1), "comment": " ".join(body.split()[:12])}
+                for label in labels
+            ]
+            return json.dumps({"reviews": reviews, "ranking": labels})
+        if "FINAL RANKING" in prompt and labels:
+            review_order(labels, agreement)
+            ranking = "\n".join(f"{i}. {label}" for i, label in enumerate(labels, 1))
+            return f"{body}\n\nFINAL RANKING:\n{ranking}"
+        return body
+
+    def usage(model: str, messages, tokens: int, mode: str) -> Dict[str, Any]:
+        prompt_tokens = sum(len(message_text(m)) for m in messages) // 4
+        cached_tokens = cached_prefix_tokens(model, messages, mode)
+        stats["prompt_tokens"] += prompt_tokens
+        stats["cached_tokens"] += cached_tokens
+        return {
+            "prompt_tokens": prompt_tokens,
+            "prompt_tokens_details": {"cached_tokens": cached_tokens},
+            "completion_tokens": tokens,
+            "total_tokens": prompt_tokens + tokens,
+            "cost": round((prompt_tokens - cached_tokens * 0.9 + tokens * 4) / 1_000_000, 8),
+        }
+
+    async def completions(request: Request):
+        try:
+            body = await request.json()
+        except ClientDisconnect:
+            # Hedged or cancelled requests may hang up before sending the body
+            return Response(status_code=499)
+        model = body["model"]
+        profile = profile_for(model)
+        stats["requests"] += 1
+
+        ttft = rng.lognormvariate(0, profile["ttft"]["sigma"]) * profile["ttft"]["median"] * time_scale
+        await asyncio.sleep(ttft)
+
+        if rng.random() < profile["failure_rate"]:
+            stats["failures"] += 1
+            return JSONResponse(
+                {"error": {"code": profile["failure_status"], "message": "injected failure"}},
+                status_code=profile["failure_status"],
+            )
+
+        text = completion_text(
+            body.get("messages", []), profile["tokens"], body.get("response_format"), profile["ranking_agreement"]
+        )
+        words = text.split(" ")
+        chunk_tokens = max(1, profile["chunk_tokens"])
+        chunk_delay = chunk_tokens / profile["tokens_per_second"] * time_scale
+        usage_block = usage(model, body.get("messages", []), len(words), profile["prompt_cache"])
+
+        if not body.get("stream"):
+            await asyncio.sleep(len(words) / profile["tokens_per_second"] * time_scale)
+            return JSONResponse({
+                "model": model,
+                "choices": [{"message": {"role": "assistant", "content": text}}],
+                "usage": usage_block,
+            })
+
+        async def events():
+            yield b": OPENROUTER PROCESSING\n\n"
+            for start in range(0, len(words), chunk_tokens):
+                piece = " ".join(words[start:start + chunk_tokens])
+                if start + chunk_tokens < len(words):
+                    piece += " "
+                chunk = {"model": model, "choices": [{"delta": {"content": piece}}]}
+                yield f"data: {json.dumps(chunk)}\n\n".encode()
+                await asyncio.sleep(chunk_delay)
+            final = {"model": model, "choices": [{"delta": {}, "finish_reason": "stop"}], "usage": usage_block}
+            yield f"data: {json.dumps(final)}\n\n".encode()
+            yield b"data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    async def get_stats(request: Request):
+        return JSONResponse(stats)
+
+    return Starlette(routes=[
+        Route("/api/v1/chat/completions", completions, methods=["POST"]),
+        Route("/stats", get_stats),
+    ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the OpenRouter API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--profile", help="JSON file with model profiles")
+    parser.add_argument("--time-scale", type=float, default=1.0)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    app = create_app(load_profiles(args.profile), args.time_scale, args.seed)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
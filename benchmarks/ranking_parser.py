@@ -0,0 +1,136 @@
+"""
+Micro-benchmark of stage 2 ranking extraction.
+
+Compares the previous regex parser (three scans, patterns compiled per call,
+re-run by the aggregator) with backend.ranking.parse_ranking on a corpus of
+review texts. The corpus is synthetic by default: reviews of realistic length
+whose rankings vary in the ways models actually get them wrong (markdown,
+capitalization, "the", duplicates, unknown and missing labels, no heading).
+--from-storage uses the stage 2 reviews saved in the configured conversation
+store instead.
+
+Usage:
+    uv run python -m benchmarks.ranking_parser --reviews 20000
+    uv run python -m benchmarks.ranking_parser --from-storage
+"""
+
+import argparse
+import random
+import re
+import time
+from typing import List, Tuple
+
+from backend.ranking import canonical_label, parse_ranking
+
+NAMES = ["security architect", "strategic advisory", "cybersecurity research", "business risk & compliance"]
+PROSE = (
+    "The answer weighs the threat model against operational cost and cites relevant controls, "
+    "although the treatment of identity federation is thin and the rollout plan lacks owners. "
+)
+
+
+def legacy_parse(ranking_text: str) -> List[str]:
+    """The parser as it was before backend.ranking, for comparison."""
+    if "FINAL RANKING:" in ranking_text:
+        parts = ranking_text.split("FINAL RANKING:")
+        if len(parts) >= 2:
+            ranking_section = parts[1]
+            numbered_matches = re.findall(r'\d+\.\s*Response from [a-z][a-z0-9 &-]+', ranking_section, re.IGNORECASE)
+            if numbered_matches:
+                return [re.search(r'Response from [a-z][a-z0-9 &-]+', m, re.IGNORECASE).group().strip() for m in numbered_matches]
+            matches = re.findall(r'Response from [a-z][a-z0-9 &-]+', ranking_section, re.IGNORECASE)
+            return [m.strip() for m in matches]
+    matches = re.findall(r'Response from [a-z][a-z0-9 &-]+', ranking_text, re.IGNORECASE)
+    return [m.strip() for m in matches]
+
+
+def synthetic_review(rng: random.Random) -> str:
+    """One review: per-response critique followed by a (sometimes malformed) ranking."""
+    order = NAMES[:]
+    rng.shuffle(order)
+    critique = "\n\n".join(
+        f"Response from {rng.choice([name, name.title()])} " + PROSE * rng.randint(2, 6)
+        for name in NAMES
+    )
+    lines = []
+    for position, name in enumerate(order, start=1):
+        label = f"Response from {rng.choice([name, name.title(), 'the ' + name])}"
+        lines.append(rng.choice([f"{position}. {label}", f"{position}. **{label}**", f"{position}) {label}"]))
+    flaw = rng.random()
+    if flaw < 0.05:
+        lines.append(lines[0])  # duplicate
+    elif flaw < 0.10:
+        lines.pop()  # missing
+    elif flaw < 0.13:
+        lines.append(f"{len(lines) + 1}. Response from an unnamed expert")  # unknown
+    heading = "" if flaw > 0.97 else rng.choice(["FINAL RANKING:", "**FINAL RANKING:**", "FINAL RANKING:\n"])
+    return f"{critique}\n\n{heading}\n" + "\n".join(lines)
+
+
+def stored_reviews() -> List[Tuple[str, List[str]]]:
+    """(review text, labels under review) for every stage 2 review in storage."""
+    from backend.storage import create_backend
+
+    backend = create_backend()
+    reviews = []
+    for meta in backend.list_conversations():
+        conversation = backend.get_conversation(meta["id"])
+        for message in conversation["messages"]:
+            labels = list((message.get("metadata") or {}).get("label_to_model", {}))
+            for review in message.get("stage2") or []:
+                reviews.append((review.get("ranking", ""), labels or None))
+    return reviews
+
+
+def bench(name: str, fn, corpus, repeat: int) -> float:
+    total_bytes = sum(len(text) for text, _ in corpus) * repeat
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for text, labels in corpus:
+            fn(text, labels)
+    elapsed = time.perf_counter() - started
+    per_parse = elapsed / (len(corpus) * repeat) * 1e6
+    print(f"{name:>22}  {per_parse:8.2f} us/review  {total_bytes / elapsed / 1e6:8.1f} MB/s")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--reviews", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--from-storage", action="store_true", help="use stage 2 reviews from the conversation store")
+    args = parser.parse_args()
+
+    if args.from_storage:
+        corpus = stored_reviews()
+    else:
+        rng = random.Random(args.seed)
+        labels = [f"Response from {name}" for name in NAMES]
+        corpus = [(synthetic_review(rng), labels) for _ in range(args.reviews)]
+    if not corpus:
+        print("No reviews found")
+        return
+
+    size = sum(len(text) for text, _ in corpus)
+    print(f"{len(corpus)} reviews, {size / 1e6:.1f} MB, x{args.repeat}")
+
+    # The old aggregator parsed every review a second time after stage 2 did
+    legacy = bench("legacy (stage 2 + agg)", lambda text, labels: (legacy_parse(text), legacy_parse(text)), corpus, args.repeat)
+    current = bench("parse_ranking", parse_ranking, corpus, args.repeat)
+    print(f"{'speedup':>22}  x{legacy / current:.2f}")
+
+    # How often each parser recovers a complete ranking of known labels
+    complete_legacy = complete_current = 0
+    for text, labels in corpus:
+        if not labels:
+            continue
+        known = set(labels)
+        legacy_labels = [canonical_label(label) for label in legacy_parse(text)]
+        complete_legacy += len(legacy_labels) == len(known) and set(legacy_labels) == known
+        complete_current += not parse_ranking(text, labels)["missing"]
+    print(f"{'complete rankings':>22}  legacy {complete_legacy}  current {complete_current}  of {len(corpus)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,342 @@
+"""
+Storage backend benchmark on synthetic conversation corpora.
+
+Generates a deterministic corpus (1-200 messages per conversation, most of
+them short, with stage payloads sized like real council turns), loads it
+into each backend and times the operations the API performs:
+
+    list_first_page   list_conversations(limit=50)
+    list_deep_page    list_conversations(limit=50, before=<random id>)
+    list_all          list_conversations()
+    get_conversation  full conversation load
+    get_last_page     get_messages(last=20)
+    append_user       add_user_message
+    append_assistant  add_assistant_message with all three stages
+    update_title      update_conversation_title
+
+Results are written as JSON so releases can be compared. With --baseline,
+any operation whose p50 regressed by more than --tolerance (and by at least
+--noise-floor-ms) against the baseline file fails the run with exit status 1.
+Each operation is timed in --repeats rounds spread over the run and the
+fastest round is kept. A backend that still looks slower is re-run up to
+--confirm times on a fresh corpus, keeping each operation's best p50, so
+the gate only fails on slowdowns that reproduce.
+
+Usage:
+    uv run python -m benchmarks.storage_corpus --conversations 1000,10000 --json storage.json
+    uv run python -m benchmarks.storage_corpus --baseline storage.json --tolerance 0.25
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Callable, Iterator
+
+from benchmarks.common import build_backend, latency_summary
+
+MEMBERS = 4
+WORDS = (
+    "threat model attacker control audit identity network segment patch exposure "
+    "risk mitigation evidence detection response incident policy vendor cloud key "
+    "rotation least privilege logging baseline supply chain dependency review"
+).split()
+
+
+def text_source(rng: random.Random, scale: float) -> Callable[[int], str]:
+    """Return a function producing pseudo-prose of roughly n bytes."""
+    pool = " ".join(rng.choice(WORDS) for _ in range(40000))
+
+    def text(n: int) -> str:
+        n = max(16, int(n * scale))
+        start = rng.randrange(0, len(pool) - n)
+        return pool[start:start + n]
+
+    return text
+
+
+def make_stages(text) -> tuple:
+    """Stage payloads sized like a real council turn (~20 KB at scale 1)."""
+    stage1 = [
+        {"model": f"provider/member-{i}", "name": f"member {i}", "response": text(2500)}
+        for i in range(MEMBERS)
+    ]
+    stage2 = [
+        {
+            "model": f"provider/member-{i}",
+            "name": f"member {i}",
+            "ranking": text(1500),
+            "parsed_ranking": [f"Response from member {j}" for j in range(MEMBERS)],
+        }
+        for i in range(MEMBERS)
+    ]
+    stage3 = {"model": "provider/chairman", "name": "chairman", "response": text(3000)}
+    return stage1, stage2, stage3
+
+
+def message_count(rng: random.Random, max_messages: int) -> int:
+    """Heavy-tailed number of messages: most conversations are a turn or two."""
+    turns = int(rng.paretovariate(1.2))
+    return max(1, min(max_messages, turns * 2))
+
+
+def generate_corpus(count: int, max_messages: int, scale: float, seed: int) -> Iterator[Dict[str, Any]]:
+    """Yield `count` conversations with increasing created_at timestamps."""
+    rng = random.Random(seed)
+    text = text_source(rng, scale)
+    origin = datetime(2024, 1, 1)
+    for index in range(count):
+        messages = []
+        for position in range(message_count(rng, max_messages)):
+            if position % 2 == 0:
+                messages.append({"role": "user", "content": text(300)})
+            else:
+                stage1, stage2, stage3 = make_stages(text)
+                messages.append({"role": "assistant", "stage1": stage1, "stage2": stage2, "stage3": stage3})
+        yield {
+            "id": f"conv-{index:07d}",
+            "created_at": (origin + timedelta(minutes=index)).isoformat(),
+            "title": f"Conversation {index}",
+            "messages": messages,
+        }
+
+
+def load_corpus(backend, name: str, corpus: Iterator[Dict[str, Any]]) -> int:
+    """Write the corpus the fastest way the backend supports."""
+    if name == "sqlite":
+        return backend.import_conversations(corpus)
+    count = 0
+    for conversation in corpus:
+        backend.save_conversation(conversation)
+        count += 1
+    return count
+
+
+def directory_bytes(path: str) -> int:
+    return sum(
+        os.path.getsize(os.path.join(root, f))
+        for root, _, files in os.walk(path)
+        for f in files
+    )
+
+
+def time_operation(fn, samples: int) -> Dict[str, float]:
+    """Call fn(i) `samples` times and summarize the per-call latency."""
+    durations = []
+    # As in timeit: a collection landing in one run but not another is noise
+    gc.collect()
+    gc.disable()
+    try:
+        for i in range(samples):
+            started = time.perf_counter()
+            fn(i)
+            durations.append(time.perf_counter() - started)
+    finally:
+        gc.enable()
+    total = sum(durations)
+    return {
+        "samples": samples,
+        "mean_ms": round(total / samples * 1000, 3),
+        **latency_summary(durations),
+        "ops_per_second": round(samples / total, 1) if total else 0.0,
+    }
+
+
+def best_of(operations: Dict[str, tuple], repeats: int) -> Dict[str, Dict[str, float]]:
+    """
+    Time every operation in `repeats` rounds and keep each one's fastest round.
+
+    Rounds run through the whole set in turn, so repeats of one operation are
+    spread over the run and a slow spell of the machine does not hit them all.
+
+    Args:
+        operations: Name -> (fn, samples)
+        repeats: Number of rounds
+
+    Returns:
+        Name -> summary of the round with the lowest p50
+    """
+    best = {}
+    for _ in range(max(1, repeats)):
+        for name, (fn, samples) in operations.items():
+            summary = time_operation(fn, samples)
+            if name not in best or summary["p50_ms"] < best[name]["p50_ms"]:
+                best[name] = summary
+    return best
+
+
+def run_backend(name: str, count: int, args) -> Dict[str, Any]:
+    """Load one corpus into one backend and time every operation."""
+    rng = random.Random(args.seed + 1)
+    ids = [f"conv-{i:07d}" for i in range(count)]
+    text = text_source(rng, args.payload_scale)
+    stages = make_stages(text)
+    samples = min(args.samples, count)
+
+    with tempfile.TemporaryDirectory(dir=args.work_dir) as directory:
+        backend = build_backend(name, directory)
+        started = time.perf_counter()
+        load_corpus(backend, name, generate_corpus(count, args.max_messages, args.payload_scale, args.seed))
+        load_seconds = time.perf_counter() - started
+        size = directory_bytes(directory)
+
+        # Reopen so caches and connections start cold, as after a restart
+        backend = build_backend(name, directory)
+
+        picks = [rng.choice(ids) for _ in range(samples)]
+        operations = best_of({
+            "list_first_page": (lambda i: backend.list_conversations(limit=50), samples),
+            "list_deep_page": (lambda i: backend.list_conversations(limit=50, before=picks[i]), samples),
+            "list_all": (lambda i: backend.list_conversations(), min(samples, args.list_all_samples)),
+            "get_conversation": (lambda i: backend.get_conversation(picks[i]), samples),
+            "get_last_page": (lambda i: backend.get_messages(picks[i], last=20), samples),
+            "append_user": (lambda i: backend.add_user_message(picks[i], text(300)), samples),
+            "append_assistant": (lambda i: backend.add_assistant_message(picks[i], *stages), samples),
+            "update_title": (lambda i: backend.update_conversation_title(picks[i], f"Title {i}"), samples),
+        }, args.repeats)
+
+    return {
+        "backend": name,
+        "conversations": count,
+        "load_seconds": round(load_seconds, 3),
+        "bytes_on_disk": size,
+        "operations": operations,
+    }
+
+
+def environment() -> Dict[str, Any]:
+    from backend.storage import codec
+    from backend.config import STORAGE_COMPRESSION, STORAGE_COMPRESS_MIN_BYTES
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "orjson": codec.orjson is not None,
+        "zstandard": codec.zstandard is not None,
+        "compression": STORAGE_COMPRESSION,
+        "compress_min_bytes": STORAGE_COMPRESS_MIN_BYTES,
+    }
+
+
+def compare(
+    results: List[Dict[str, Any]],
+    baseline: Dict[str, Any],
+    tolerance: float,
+    noise_floor_ms: float = 0.1
+) -> List[Dict[str, Any]]:
+    """
+    Return the operations whose p50 regressed beyond the tolerance.
+
+    Slowdowns smaller than noise_floor_ms are ignored whatever their ratio:
+    sub-millisecond operations jitter by more than any sensible tolerance.
+    """
+    previous = {
+        (entry["backend"], entry["conversations"]): entry["operations"]
+        for entry in baseline["results"]
+    }
+    regressions = []
+    for entry in results:
+        old_operations = previous.get((entry["backend"], entry["conversations"]))
+        if old_operations is None:
+            continue
+        for operation, summary in entry["operations"].items():
+            old = old_operations.get(operation)
+            if not old or not old["p50_ms"]:
+                continue
+            ratio = summary["p50_ms"] / old["p50_ms"]
+            if ratio > 1 + tolerance and summary["p50_ms"] - old["p50_ms"] >= noise_floor_ms:
+                regressions.append({
+                    "backend": entry["backend"],
+                    "conversations": entry["conversations"],
+                    "operation": operation,
+                    "old_ms": old["p50_ms"],
+                    "new_ms": summary["p50_ms"],
+                    "ratio": ratio,
+                })
+    return regressions
+
+
+def confirm(results: List[Dict[str, Any]], regressions: List[Dict[str, Any]], args) -> None:
+    """
+    Re-run each backend that regressed and keep every operation's best p50.
+
+    A fresh corpus and backend per attempt, so a slow spell of the machine or
+    an unlucky file layout has to repeat before the run fails.
+    """
+    suspects = {(r["backend"], r["conversations"]) for r in regressions}
+    for entry in results:
+        if (entry["backend"], entry["conversations"]) not in suspects:
+            continue
+        retry = run_backend(entry["backend"], entry["conversations"], args)
+        for operation, summary in retry["operations"].items():
+            if summary["p50_ms"] < entry["operations"][operation]["p50_ms"]:
+                entry["operations"][operation] = summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--backends", default="sqlite,jsonl,json", help="comma list of sqlite, jsonl, json")
+    parser.add_argument("--conversations", default="1000", help="comma list of corpus sizes")
+    parser.add_argument("--max-messages", type=int, default=200)
+    parser.add_argument("--payload-scale", type=float, default=1.0, help="multiplier for stage payload sizes")
+    parser.add_argument("--samples", type=int, default=200, help="calls per operation")
+    parser.add_argument("--repeats", type=int, default=5, help="rounds per operation; the fastest p50 is kept")
+    parser.add_argument("--list-all-samples", type=int, default=20, help="calls of the unpaged listing")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--work-dir", help="where to create scratch corpora (default: system temp)")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--baseline", help="results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed p50 slowdown, e.g. 0.25 = 25%%")
+    parser.add_argument("--noise-floor-ms", type=float, default=0.1, help="ignore p50 slowdowns smaller than this")
+    parser.add_argument("--confirm", type=int, default=2, help="re-runs of a regressed backend before failing")
+    args = parser.parse_args()
+
+    results = []
+    for count in (int(n) for n in args.conversations.split(",")):
+        for name in args.backends.split(","):
+            entry = run_backend(name, count, args)
+            results.append(entry)
+            print(
+                f"{name:>6}  n={count:<7} load {entry['load_seconds']:8.2f}s"
+                f"  disk {entry['bytes_on_disk'] / 1e6:9.1f}MB"
+            )
+            for operation, summary in entry["operations"].items():
+                print(
+                    f"        {operation:<17} p50 {summary['p50_ms']:9.3f}ms"
+                    f"  p99 {summary['p99_ms']:9.3f}ms  {summary['ops_per_second']:10.1f}/s"
+                )
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance, args.noise_floor_ms)
+        for _ in range(args.confirm):
+            if not regressions:
+                break
+            confirm(results, regressions, args)
+            regressions = compare(results, baseline, args.tolerance, args.noise_floor_ms)
+
+    report = {"environment": environment(), "args": vars(args), "results": results}
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+    for r in regressions:
+        print(
+            f"REGRESSION {r['backend']} n={r['conversations']} {r['operation']}: "
+            f"p50 {r['old_ms']}ms -> {r['new_ms']}ms (x{r['ratio']:.2f})",
+            file=sys.stderr
+        )
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Event-loop lag under concurrent councils, blocking vs. async storage.
+
+Each simulated council performs the storage calls of one streamed council
+turn (user message, title, assistant message with all stages, reload) with
+a short sleep standing in for the upstream model calls. A probe task
+measures how late the event loop wakes it up; with blocking storage every
+disk write shows up as lag for every other stream.
+
+Usage:
+    uv run python -m benchmarks.storage_loop_lag --councils 50 --backend json
+"""
+
+import argparse
+import asyncio
+import tempfile
+import time
+import uuid
+
+from backend import storage
+from benchmarks.common import LoopLagProbe, build_backend
+
+
+def make_stages(payload_kb: int):
+    """Build stage payloads roughly the size of a real council answer."""
+    text = "lorem ipsum dolor sit amet " * (payload_kb * 1024 // 27 // 6 + 1)
+    stage1 = [{"model": f"member-{i}", "response": text} for i in range(4)]
+    stage2 = [{"model": f"member-{i}", "ranking": text, "parsed_ranking": []} for i in range(4)]
+    stage3 = {"model": "chairman", "response": text}
+    return stage1, stage2, stage3
+
+
+async def council_blocking(backend, stages, turns: int):
+    conversation_id = str(uuid.uuid4())
+    backend.create_conversation(conversation_id)
+    for turn in range(turns):
+        backend.add_user_message(conversation_id, "question")
+        await asyncio.sleep(0.01)
+        if turn == 0:
+            backend.update_conversation_title(conversation_id, "title")
+        backend.add_assistant_message(conversation_id, *stages)
+        backend.get_conversation(conversation_id)
+
+
+async def council_async(stages, turns: int):
+    conversation_id = str(uuid.uuid4())
+    await storage.create_conversation(conversation_id)
+    for turn in range(turns):
+        await storage.add_user_message(conversation_id, "question")
+        await asyncio.sleep(0.01)
+        if turn == 0:
+            await storage.update_conversation_title(conversation_id, "title")
+        await storage.add_assistant_message(conversation_id, *stages)
+        await storage.get_conversation(conversation_id)
+
+
+async def run(mode: str, backend, councils: int, turns: int, payload_kb: int):
+    storage.set_backend(backend)
+    stages = make_stages(payload_kb)
+    start = time.perf_counter()
+    async with LoopLagProbe() as probe:
+        if mode == "blocking":
+            await asyncio.gather(*(council_blocking(backend, stages, turns) for _ in range(councils)))
+        else:
+            await asyncio.gather(*(council_async(stages, turns) for _ in range(councils)))
+    elapsed = time.perf_counter() - start
+
+    lag = probe.summary()
+    print(
+        f"{mode:>9}  wall {elapsed:6.2f}s  lag p50 {lag['p50_ms']:7.2f}ms"
+        f"  p99 {lag['p99_ms']:7.2f}ms  max {lag['max_ms']:7.2f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--councils", type=int, default=50)
+    parser.add_argument("--turns", type=int, default=3)
+    parser.add_argument("--payload-kb", type=int, default=64, help="size of each stage's text")
+    parser.add_argument("--backend", choices=["json", "jsonl", "sqlite"], default="json")
+    args = parser.parse_args()
+
+    print(f"{args.councils} concurrent councils x {args.turns} turns, {args.backend} backend")
+    for mode in ("blocking", "async"):
+        with tempfile.TemporaryDirectory() as directory:
+            backend = build_backend(args.backend, directory)
+            asyncio.run(run(mode, backend, args.councils, args.turns, args.payload_kb))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import Sidebar from './components/Sidebar';
 import ChatInterface from './components/ChatInterface';
 import MembersView from './components/MembersView';
@@ -8,8 +8,40 @@ import DebateMembersView from './components/DebateMembersView';
 import { api } from './api';
 import './App.css';
 
+// Append a streamed chunk to the matching in-progress entry, creating it on first chunk.
+function appendDelta(items, event, keyField, textField) {
+  const next = [...(items || [])];
+  const index = next.findIndex((item) => item[keyField] === event[keyField]);
+  if (index === -1) {
+    const { type, delta, ...info } = event;
+    next.push({ ...info, [textField]: delta });
+  } else {
+    // A restart means a fallback model replaced a failed attempt: start over
+    const text = event.restart ? event.delta : next[index][textField] + event.delta;
+    next[index] = { ...next[index], [textField]: text };
+  }
+  return next;
+}
+
+// Insert a finished entry, replacing any in-progress entry with the same key.
+function upsertItem(items, item, keyField) {
+  const next = [...(items || [])];
+  const index = next.findIndex((existing) => existing[keyField] === item[keyField]);
+  if (index === -1) {
+    next.push(item);
+  } else {
+    next[index] = item;
+  }
+  return next;
+}
+
+const CONVERSATION_PAGE_SIZE = 50;
+const MESSAGE_PAGE_SIZE = 20;
+
 function App() {
   const [conversations, setConversations] = useState([]);
+  const [hasMoreConversations, setHasMoreConversations] = useState(false);
+  const loadedConversationCount = useRef(0);
   const [currentConversationId, setCurrentConversationId] = useState(null);
   const [currentConversation, setCurrentConversation] = useState(null);
   const [isLoading, setIsLoading] = useState(false);
@@ -61,8 +93,26 @@ function App() {
 
   const loadConversations = async () => {
     try {
-      const convs = await api.listConversations();
+      // Refresh everything already shown so earlier pages stay loaded
+      const count = Math.max(CONVERSATION_PAGE_SIZE, loadedConversationCount.current);
+      const { conversations: convs, hasMore } = await api.listConversationWindow(count);
+      loadedConversationCount.current = convs.length;
       setConversations(convs);
+      setHasMoreConversations(hasMore);
+    } catch (error) {
+      console.error('Failed to load conversations:', error);
+    }
+  };
+
+  const loadMoreConversations = async () => {
+    if (conversations.length === 0) return;
+    try {
+      const before = conversations[conversations.length - 1].id;
+      const page = await api.listConversations({ limit: CONVERSATION_PAGE_SIZE, before });
+      const next = [...conversations, ...page];
+      loadedConversationCount.current = next.length;
+      setConversations(next);
+      setHasMoreConversations(page.length === CONVERSATION_PAGE_SIZE);
     } catch (error) {
       console.error('Failed to load conversations:', error);
     }
@@ -70,13 +120,30 @@ function App() {
 
   const loadConversation = async (id) => {
     try {
-      const conv = await api.getConversation(id);
+      const conv = await api.getConversation(id, { last: MESSAGE_PAGE_SIZE });
       setCurrentConversation(conv);
     } catch (error) {
       console.error('Failed to load conversation:', error);
     }
   };
 
+  const loadEarlierMessages = async () => {
+    if (!currentConversation?.offset) return;
+    try {
+      const page = await api.getConversation(currentConversation.id, {
+        last: MESSAGE_PAGE_SIZE,
+        before: currentConversation.offset,
+      });
+      setCurrentConversation((prev) => ({
+        ...prev,
+        messages: [...page.messages, ...prev.messages],
+        offset: page.offset,
+      }));
+    } catch (error) {
+      console.error('Failed to load conversation:', error);
+    }
+  };
+
   const handleNewConversation = async () => {
     try {
       const newConv = await api.createConversation();
@@ -148,7 +215,7 @@ function App() {
       messages: [...prev.messages, userMessage],
     }));
 
-    setDebateState({ phase: 'openings', openings: null, rounds: [], round: 0 });
+    setDebateState({ phase: 'openings', openings: null, rounds: [], round: 0, draft: [] });
 
     try {
       await api.sendMessageStream(
@@ -160,10 +227,19 @@ function App() {
               setDebateState((prev) => ({ ...prev, phase: 'openings' }));
               break;
 
+            case 'opening_delta':
+            case 'round_delta':
+              setDebateState((prev) => ({
+                ...prev,
+                draft: appendDelta(prev.draft, event, 'persona', 'content'),
+              }));
+              break;
+
             case 'openings_complete':
               setDebateState((prev) => ({
                 ...prev,
                 openings: event.data,
+                draft: [],
                 phase: 'round',
               }));
               break;
@@ -173,6 +249,7 @@ function App() {
                 ...prev,
                 phase: 'round',
                 round: event.round,
+                draft: [],
               }));
               break;
 
@@ -180,6 +257,7 @@ function App() {
               setDebateState((prev) => ({
                 ...prev,
                 rounds: [...prev.rounds, event.data],
+                draft: [],
               }));
               break;
 
@@ -187,6 +265,17 @@ function App() {
               setDebateState((prev) => ({ ...prev, phase: 'verdict' }));
               break;
 
+            case 'verdict_delta':
+              setDebateState((prev) => ({
+                ...prev,
+                verdictDraft: {
+                  moderator: event.moderator,
+                  model: event.model,
+                  content: (event.restart ? '' : prev.verdictDraft?.content || '') + event.delta,
+                },
+              }));
+              break;
+
             case 'verdict_complete':
               setDebateState((prev) => ({ ...prev, verdict: event.data }));
               break;
@@ -275,6 +364,26 @@ function App() {
             });
             break;
 
+          case 'stage1_delta':
+            setCurrentConversation((prev) => {
+              const messages = [...prev.messages];
+              const lastMsg = { ...messages[messages.length - 1] };
+              lastMsg.stage1 = appendDelta(lastMsg.stage1, event, 'name', 'response');
+              messages[messages.length - 1] = lastMsg;
+              return { ...prev, messages };
+            });
+            break;
+
+          case 'stage1_member_complete':
+            setCurrentConversation((prev) => {
+              const messages = [...prev.messages];
+              const lastMsg = { ...messages[messages.length - 1] };
+              lastMsg.stage1 = upsertItem(lastMsg.stage1, event.data, 'name');
+              messages[messages.length - 1] = lastMsg;
+              return { ...prev, messages };
+            });
+            break;
+
           case 'stage1_complete':
             setCurrentConversation((prev) => {
               const messages = [...prev.messages];
@@ -294,6 +403,20 @@ function App() {
             });
             break;
 
+          case 'stage2_member_complete':
+            setCurrentConversation((prev) => {
+              const messages = [...prev.messages];
+              const lastMsg = { ...messages[messages.length - 1] };
+              lastMsg.stage2 = upsertItem(lastMsg.stage2, event.data, 'name');
+              messages[messages.length - 1] = lastMsg;
+              return { ...prev, messages };
+            });
+            break;
+
+          case 'stage2_early_exit':
+            // Reported again in the stage2_complete metadata
+            break;
+
           case 'stage2_complete':
             setCurrentConversation((prev) => {
               const messages = [...prev.messages];
@@ -314,6 +437,18 @@ function App() {
             });
             break;
 
+          case 'stage3_delta':
+            setCurrentConversation((prev) => {
+              const messages = [...prev.messages];
+              const lastMsg = { ...messages[messages.length - 1] };
+              lastMsg.stage3 = appendDelta(
+                lastMsg.stage3 ? [lastMsg.stage3] : [], event, 'name', 'response'
+              )[0];
+              messages[messages.length - 1] = lastMsg;
+              return { ...prev, messages };
+            });
+            break;
+
           case 'stage3_complete':
             setCurrentConversation((prev) => {
               const messages = [...prev.messages];
@@ -362,6 +497,8 @@ function App() {
     <div className="app">
       <Sidebar
         conversations={conversations}
+        hasMoreConversations={hasMoreConversations}
+        onLoadMoreConversations={loadMoreConversations}
         currentConversationId={currentConversationId}
         onSelectConversation={handleSelectConversation}
         onNewConversation={handleNewConversation}
@@ -387,6 +524,7 @@ function App() {
       ) : currentView === 'debate' ? (
         <DebateView
           conversation={currentConversation}
+          onLoadEarlier={loadEarlierMessages}
           onSendMessage={handleDebateMessage}
           isLoading={isLoading}
           debateState={debateState}
@@ -395,6 +533,7 @@ function App() {
       ) : (
         <ChatInterface
           conversation={currentConversation}
+          onLoadEarlier={loadEarlierMessages}
           onSendMessage={handleSendMessage}
           isLoading={isLoading}
           personas={personas}
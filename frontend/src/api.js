@@ -4,18 +4,50 @@
 
 const API_BASE = 'http://localhost:8001';
 
+// Largest page GET /api/conversations accepts
+export const MAX_CONVERSATION_PAGE = 500;
+
 export const api = {
   /**
-   * List all conversations.
+   * List conversations, newest first.
+   * @param {Object} page - Optional { limit, before } where before is the id
+   *   of the last conversation already loaded
    */
-  async listConversations() {
-    const response = await fetch(`${API_BASE}/api/conversations`);
+  async listConversations({ limit, before } = {}) {
+    const params = new URLSearchParams();
+    if (limit) params.set('limit', limit);
+    if (before) params.set('before', before);
+    const query = params.toString();
+    const response = await fetch(
+      `${API_BASE}/api/conversations${query ? `?${query}` : ''}`
+    );
     if (!response.ok) {
       throw new Error('Failed to list conversations');
     }
     return response.json();
   },
 
+  /**
+   * List the newest conversations, however many, in pages the backend accepts.
+   * @param {number} count - Number of conversations to load
+   * @returns {Promise<{conversations: Array, hasMore: boolean}>}
+   */
+  async listConversationWindow(count) {
+    const conversations = [];
+    while (conversations.length < count) {
+      const limit = Math.min(count - conversations.length, MAX_CONVERSATION_PAGE);
+      const before = conversations.length
+        ? conversations[conversations.length - 1].id
+        : undefined;
+      const page = await this.listConversations({ limit, before });
+      conversations.push(...page);
+      if (page.length < limit) {
+        return { conversations, hasMore: false };
+      }
+    }
+    return { conversations, hasMore: true };
+  },
+
   /**
    * Create a new conversation.
    */
@@ -35,10 +67,18 @@ export const api = {
 
   /**
    * Get conversation by id.
+   * @param {Object} range - Optional { last, before, exclude }: the latest
+   *   `last` messages before index `before`, without the comma-separated
+   *   `exclude` fields
    */
-  async getConversation(conversationId) {
+  async getConversation(conversationId, { last, before, exclude } = {}) {
+    const params = new URLSearchParams();
+    if (last !== undefined) params.set('last', last);
+    if (before !== undefined) params.set('before', before);
+    if (exclude) params.set('exclude', exclude);
+    const query = params.toString();
     const response = await fetch(
-      `${API_BASE}/api/conversations/${conversationId}`
+      `${API_BASE}/api/conversations/${conversationId}${query ? `?${query}` : ''}`
     );
     if (!response.ok) {
       throw new Error('Failed to get conversation');
@@ -0,0 +1,46 @@
+import { test, afterEach } from 'node:test';
+import assert from 'node:assert/strict';
+import { api, MAX_CONVERSATION_PAGE } from './api.js';
+
+const realFetch = globalThis.fetch;
+
+// A backend holding `total` conversations that rejects limits above the cap like main.py
+function fakeBackend(total) {
+  const ids = Array.from({ length: total }, (_, i) => `c${i}`);
+  const requests = [];
+  globalThis.fetch = async (url) => {
+    const params = new URL(url).searchParams;
+    const limit = Number(params.get('limit'));
+    requests.push({ limit, before: params.get('before') });
+    if (limit > MAX_CONVERSATION_PAGE) {
+      return { ok: false, status: 422, json: async () => ({}) };
+    }
+    const before = params.get('before');
+    const start = before ? ids.indexOf(before) + 1 : 0;
+    const page = ids.slice(start, start + limit).map((id) => ({ id }));
+    return { ok: true, json: async () => page };
+  };
+  return requests;
+}
+
+afterEach(() => {
+  globalThis.fetch = realFetch;
+});
+
+test('a window above the page cap is fetched in pages', async () => {
+  const requests = fakeBackend(1200);
+  const { conversations, hasMore } = await api.listConversationWindow(1100);
+  assert.equal(conversations.length, 1100);
+  assert.equal(conversations[1099].id, 'c1099');
+  assert.equal(hasMore, true);
+  assert.deepEqual(requests.map((r) => r.limit), [500, 500, 100]);
+  assert.deepEqual(requests.map((r) => r.before), [null, 'c499', 'c999']);
+});
+
+test('a short page ends the window', async () => {
+  const requests = fakeBackend(620);
+  const { conversations, hasMore } = await api.listConversationWindow(800);
+  assert.equal(conversations.length, 620);
+  assert.equal(hasMore, false);
+  assert.equal(requests.length, 2);
+});
@@ -8,6 +8,7 @@ import './ChatInterface.css';
 
 export default function ChatInterface({
   conversation,
+  onLoadEarlier,
   onSendMessage,
   isLoading,
   personas,
@@ -122,8 +123,14 @@ export default function ChatInterface({
             </form>
           </div>
         ) : (
-          conversation.messages.map((msg, index) => (
-            <div key={index} className="message-group">
+          <>
+          {conversation.offset > 0 && (
+            <button className="load-earlier-btn" onClick={onLoadEarlier}>
+              Load earlier messages
+            </button>
+          )}
+          {conversation.messages.map((msg, index) => (
+            <div key={(conversation.offset || 0) + index} className="message-group">
               {msg.role === 'user' ? (
                 <div className="user-message">
                   <div className="message-label">You</div>
@@ -158,6 +165,8 @@ export default function ChatInterface({
                       rankings={msg.stage2}
                       labelToModel={msg.metadata?.label_to_model}
                       aggregateRankings={msg.metadata?.aggregate_rankings}
+                      aggregation={msg.metadata?.aggregation}
+                      earlyExit={msg.metadata?.early_exit}
                     />
                   )}
 
@@ -172,7 +181,8 @@ export default function ChatInterface({
                 </div>
               )}
             </div>
-          ))
+          ))}
+          </>
         )}
 
         {isLoading && (
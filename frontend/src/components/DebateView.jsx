@@ -4,6 +4,7 @@ import './DebateView.css';
 
 export default function DebateView({
   conversation,
+  onLoadEarlier,
   onSendMessage,
   isLoading,
   debateState,
@@ -157,7 +158,14 @@ export default function DebateView({
           </div>
         ) : debateState.phase === 'openings' ? (
           <div className="phase-section">
-            {renderLoadingPhase('Collecting opening statements...')}
+            {debateState.draft?.length > 0 ? (
+              <>
+                <h3 className="phase-title">Opening Statements</h3>
+                {renderStatementsGrid(debateState.draft, 'stream-openings-draft')}
+              </>
+            ) : (
+              renderLoadingPhase('Collecting opening statements...')
+            )}
           </div>
         ) : null}
 
@@ -174,7 +182,14 @@ export default function DebateView({
           debateState.openings &&
           debateState.round > (debateState.rounds || []).length && (
             <div className="phase-section">
-              {renderLoadingPhase(`Round ${debateState.round} in progress...`)}
+              {debateState.draft?.length > 0 ? (
+                <>
+                  <h3 className="phase-title">Round {debateState.round}</h3>
+                  {renderStatementsGrid(debateState.draft, `stream-round-draft-${debateState.round}`)}
+                </>
+              ) : (
+                renderLoadingPhase(`Round ${debateState.round} in progress...`)
+              )}
             </div>
           )}
 
@@ -185,7 +200,9 @@ export default function DebateView({
           </div>
         ) : debateState.phase === 'verdict' ? (
           <div className="phase-section">
-            {renderLoadingPhase('Moderator deliberating...')}
+            {debateState.verdictDraft
+              ? renderVerdict(debateState.verdictDraft)
+              : renderLoadingPhase('Moderator deliberating...')}
           </div>
         ) : null}
       </div>
@@ -213,9 +230,15 @@ export default function DebateView({
       </div>
 
       <div className="debate-messages-container">
+        {conversation?.offset > 0 && (
+          <button className="load-earlier-btn" onClick={onLoadEarlier}>
+            Load earlier messages
+          </button>
+        )}
+
         {/* Render saved messages */}
         {conversation?.messages?.map((msg, index) => (
-          <div key={index} className="message-group">
+          <div key={(conversation.offset || 0) + index} className="message-group">
             {msg.role === 'user' ? (
               <div className="debate-topic-card">
                 <div className="topic-label">Debate Topic</div>
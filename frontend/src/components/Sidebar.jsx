@@ -3,6 +3,8 @@ import './Sidebar.css';
 
 export default function Sidebar({
   conversations,
+  hasMoreConversations,
+  onLoadMoreConversations,
   currentConversationId,
   onSelectConversation,
   onNewConversation,
@@ -70,6 +72,11 @@ export default function Sidebar({
             </div>
           ))
         )}
+        {hasMoreConversations && (
+          <button className="sidebar-btn load-more-btn" onClick={onLoadMoreConversations}>
+            Load more
+          </button>
+        )}
       </div>
     </div>
   );
@@ -15,7 +15,7 @@ function deAnonymizeText(text, labelToModel) {
   return result;
 }
 
-export default function Stage2({ rankings, labelToModel, aggregateRankings }) {
+export default function Stage2({ rankings, labelToModel, aggregateRankings, aggregation, earlyExit }) {
   const [activeTab, setActiveTab] = useState(0);
 
   if (!rankings || rankings.length === 0) {
@@ -61,12 +61,14 @@ export default function Stage2({ rankings, labelToModel, aggregateRankings }) {
             <ol>
               {rankings[activeTab].parsed_ranking.map((label, i) => {
                 const info = labelToModel && labelToModel[label];
+                const score = rankings[activeTab].scores?.[label];
+                const scoreText = score !== undefined ? ` - ${score}/10` : '';
                 if (info) {
                   const personaName = info.name || 'Unknown';
                   const modelShortName = info.model.split('/')[1] || info.model;
-                  return <li key={i}>{personaName} ({modelShortName})</li>;
+                  return <li key={i}>{personaName} ({modelShortName}){scoreText}</li>;
                 }
-                return <li key={i}>{label}</li>;
+                return <li key={i}>{label}{scoreText}</li>;
               })}
             </ol>
           </div>
@@ -77,8 +79,20 @@ export default function Stage2({ rankings, labelToModel, aggregateRankings }) {
         <div className="aggregate-rankings">
           <h4>Aggregate Rankings (Street Cred)</h4>
           <p className="stage-description">
-            Combined results across all peer evaluations (lower score is better):
+            Combined results across all peer evaluations
+            {aggregation && aggregation.method !== 'mean'
+              ? ` (${aggregation.method}${aggregation.exclude_self_votes ? ', self-votes excluded' : ''}, best first):`
+              : ' (lower score is better):'}
           </p>
+          {earlyExit && (
+            <p className="stage-description">
+              Reviews stopped after {earlyExit.reviews} of {earlyExit.reviews + earlyExit.skipped.length} once
+              {' '}{earlyExit.leader} was settled in the lead
+              {earlyExit.requested_policy && earlyExit.requested_policy !== earlyExit.policy
+                ? ` (policy "${earlyExit.policy}": "${earlyExit.requested_policy}" is not available for this aggregation method).`
+                : '.'}
+            </p>
+          )}
           <div className="aggregate-list">
             {aggregateRankings.map((agg, index) => {
               const personaName = agg.name || 'Unknown';
@@ -13,6 +13,11 @@ export default function Stage3({ finalResponse }) {
         <div className="chairman-label">
           Chairman: {finalResponse.name} ({finalResponse.model.split('/')[1] || finalResponse.model})
         </div>
+        {finalResponse.context && finalResponse.context.strategy !== 'full' && (
+          <div className="chairman-label">
+            Context compressed to fit {finalResponse.context.budget} tokens ({finalResponse.context.steps.join(', ')})
+          </div>
+        )}
         <div className="final-text markdown-content">
           <ReactMarkdown>{finalResponse.response}</ReactMarkdown>
         </div>